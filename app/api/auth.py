@@ -1,50 +1,66 @@
 """Authentication module for OpenList2STRM"""
 
+import base64
 import hashlib
-import secrets
+import hmac
+import os
+import re
 import time
 import logging
+from collections import OrderedDict
 from typing import Optional
 
-from fastapi import Request, HTTPException, Depends, status
-from fastapi.responses import RedirectResponse
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import Request, status
+from fastapi.responses import ORJSONResponse, RedirectResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from app.config import get_config
+from app.config import WebAuthConfig, get_config, get_config_version
 
 logger = logging.getLogger(__name__)
 
-# Session storage (in-memory, resets on restart)
-_sessions: dict[str, dict] = {}
-
-# Security
-security = HTTPBearer(auto_error=False)
+# Session storage (in-memory, resets on restart).
+# Insertion order == creation order, so expired sessions are always at the front.
+_sessions: OrderedDict[str, dict] = OrderedDict()
 
 # Session configuration
-SESSION_COOKIE_NAME = "openlist2strm_session"
+SESSION_COOKIE_NAME = "openlist2strm_session"  # value: 22-char urlsafe ID
+SESSION_ID_BYTES = 16  # 128-bit session IDs
 SESSION_MAX_AGE = 7 * 24 * 60 * 60  # 7 days
+_REAP_THRESHOLD = 256  # Only sweep expired sessions once the table grows past this
+
+# Monotonic clock so wall-clock jumps don't expire (or extend) sessions
+_now = time.monotonic
+
+# Password salt, kept as bytes so hashing skips the f-string + encode step
+_SALT_PREFIX = b"openlist2strm_salt_v1"
+
+# CSPRNG + encoder bound once; same source secrets.token_urlsafe uses
+_urandom = os.urandom
+_b64 = base64.urlsafe_b64encode
 
 
 def hash_password(password: str) -> str:
     """Hash password using SHA256 with salt"""
     # Using simple hash for portability (no bcrypt dependency)
-    salt = "openlist2strm_salt_v1"
-    return hashlib.sha256(f"{salt}{password}".encode()).hexdigest()
+    return hashlib.sha256(_SALT_PREFIX + password.encode()).hexdigest()
 
 
 def verify_password(password: str, hashed: str) -> bool:
-    """Verify password against hash"""
-    return hash_password(password) == hashed
+    """Verify password against hash (constant-time compare)"""
+    return hmac.compare_digest(hash_password(password).encode(), hashed.encode())
 
 
 def generate_session_id() -> str:
     """Generate a secure session ID"""
-    return secrets.token_urlsafe(32)
+    # 128 bits from the OS CSPRNG is ample for an unguessable session ID
+    # and keeps the cookie at 22 chars instead of 43.
+    return _b64(_urandom(SESSION_ID_BYTES)).rstrip(b"=").decode("ascii")
 
 
 def generate_api_token() -> str:
     """Generate a new random API token with sk- prefix"""
-    return f"sk-{secrets.token_urlsafe(48)}"
+    # 48 bytes encode to exactly 64 chars, so there is no padding to strip
+    return "sk-" + _b64(_urandom(48)).decode("ascii")
 
 
 def create_session(username: str) -> str:
@@ -52,40 +68,67 @@ def create_session(username: str) -> str:
     session_id = generate_session_id()
     _sessions[session_id] = {
         "username": username,
-        "created_at": time.time(),
-        "last_access": time.time(),
+        "created_at": int(_now()),
     }
     logger.info(f"Session created for user: {username}")
     return session_id
 
 
+def _reap_expired(now: int) -> None:
+    """Drop expired sessions from the front of the (creation-ordered) table"""
+    while _sessions:
+        session = next(iter(_sessions.values()))
+        if now - session["created_at"] <= SESSION_MAX_AGE:
+            break
+        _sessions.popitem(last=False)
+
+
 def get_session(session_id: str) -> Optional[dict]:
     """Get session data"""
-    if session_id not in _sessions:
+    now = int(_now())
+    if len(_sessions) > _REAP_THRESHOLD:
+        _reap_expired(now)
+
+    session = _sessions.get(session_id)
+    if session is None:
         return None
     
-    session = _sessions[session_id]
-    
     # Check if session expired
-    if time.time() - session["created_at"] > SESSION_MAX_AGE:
+    if now - session["created_at"] > SESSION_MAX_AGE:
         del _sessions[session_id]
         return None
     
-    # Update last access time
-    session["last_access"] = time.time()
     return session
 
 
 def delete_session(session_id: str):
     """Delete a session"""
-    if session_id in _sessions:
-        del _sessions[session_id]
+    _sessions.pop(session_id, None)
+
+
+# (config version, web.auth section, api_token as bytes)
+_auth_cache: Optional[tuple[int, WebAuthConfig, bytes]] = None
+
+
+def _auth_snapshot() -> tuple[WebAuthConfig, bytes]:
+    """Get web.auth config, re-fetched only when the config version changes"""
+    global _auth_cache
+    version = get_config_version()
+    cached = _auth_cache
+    if cached is None or cached[0] != version:
+        auth = get_config().web.auth
+        cached = _auth_cache = (version, auth, auth.api_token.encode())
+    return cached[1], cached[2]
+
+
+def _auth() -> WebAuthConfig:
+    """Get the cached web.auth config section"""
+    return _auth_snapshot()[0]
 
 
 def is_auth_enabled() -> bool:
     """Check if authentication is enabled"""
-    config = get_config()
-    return config.web.auth.enabled
+    return _auth().enabled
 
 
 def get_session_from_request(request: Request) -> Optional[dict]:
@@ -98,30 +141,31 @@ def get_session_from_request(request: Request) -> Optional[dict]:
 
 def verify_api_token(token: str) -> bool:
     """Verify API token"""
-    config = get_config()
-    if not config.web.auth.api_token:
+    _, api_token = _auth_snapshot()
+    if not api_token:
         return False
-    return secrets.compare_digest(token, config.web.auth.api_token)
+    return hmac.compare_digest(token.encode(), api_token)
 
 
-async def get_current_user(
-    request: Request,
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> Optional[str]:
+def get_current_user(request: Request) -> Optional[str]:
     """
     Get current authenticated user from session or API token.
     Returns username if authenticated, None otherwise.
     """
-    config = get_config()
+    auth, api_token = _auth_snapshot()
     
     # If auth is disabled, return default user
-    if not config.web.auth.enabled:
+    if not auth.enabled:
         return "admin"
     
-    # Check API token first (for API calls)
-    if credentials and credentials.credentials:
-        if verify_api_token(credentials.credentials):
-            return "api_user"
+    # Check API token first (for API calls). The Bearer header is parsed
+    # here directly instead of through fastapi's HTTPBearer dependency.
+    header = request.headers.get("authorization")
+    if header and api_token:
+        scheme, _, token = header.partition(" ")
+        if token and scheme.lower() == "bearer":
+            if hmac.compare_digest(token.strip().encode(), api_token):
+                return "api_user"
     
     # Check session
     session = get_session_from_request(request)
@@ -131,34 +175,12 @@ async def get_current_user(
     return None
 
 
-async def require_auth(
-    request: Request,
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> str:
-    """
-    Dependency that requires authentication.
-    Raises 401 if not authenticated.
-    """
-    user = await get_current_user(request, credentials)
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    return user
-
-
 def require_auth_redirect(request: Request) -> Optional[RedirectResponse]:
     """
     Check authentication for web pages.
     Returns redirect response if not authenticated, None if OK.
     """
-    config = get_config()
-    
-    if not config.web.auth.enabled:
+    if not _auth().enabled:
         return None
     
     session = get_session_from_request(request)
@@ -173,15 +195,15 @@ def login_user(username: str, password: str) -> Optional[str]:
     Attempt to log in a user.
     Returns session_id if successful, None otherwise.
     """
-    config = get_config()
+    auth = _auth()
     
     # Check username
-    if username != config.web.auth.username:
+    if username != auth.username:
         logger.warning(f"Login failed: invalid username '{username}'")
         return None
     
     # Check password
-    stored_password = config.web.auth.password
+    stored_password = auth.password
     
     # If password is empty, it means first-time setup needed
     if not stored_password:
@@ -189,26 +211,75 @@ def login_user(username: str, password: str) -> Optional[str]:
         return None
     
     # Check if password matches (support both plain and hashed)
-    if password == stored_password or verify_password(password, stored_password):
+    if hmac.compare_digest(password.encode(), stored_password.encode()) or verify_password(password, stored_password):
         return create_session(username)
     
     logger.warning(f"Login failed: invalid password for user '{username}'")
     return None
 
 
-# Exempt paths that don't require authentication
-EXEMPT_PATHS = [
+# Exempt paths that don't require authentication (a tuple: the matcher
+# below is compiled once at import)
+EXEMPT_PATHS = (
     "/api/health",
     "/login",
     "/api/auth/login",
+    "/api/auth/logout",
+    "/api/auth/status",
     "/static",
     "/favicon.ico",
-]
+)
+
+
+def _build_exempt_re() -> re.Pattern:
+    """Compile EXEMPT_PATHS into one anchored prefix pattern"""
+    alternatives = "|".join(re.escape(p) for p in sorted(EXEMPT_PATHS, key=len, reverse=True))
+    return re.compile(rf"(?:{alternatives})(?:/|$)")
+
+
+_EXEMPT_RE = _build_exempt_re()
 
 
 def is_exempt_path(path: str) -> bool:
     """Check if path is exempt from authentication"""
-    for exempt in EXEMPT_PATHS:
-        if path.startswith(exempt):
-            return True
-    return False
+    return _EXEMPT_RE.match(path) is not None
+
+
+# Path prefix guarded by AuthMiddleware; web pages handle auth themselves
+PROTECTED_PREFIX = "/api"
+
+
+class AuthMiddleware:
+    """
+    ASGI middleware enforcing authentication for API requests.
+    
+    Runs the auth check once per request instead of resolving a
+    dependency on every protected route. The authenticated username is
+    exposed to handlers as ``request.state.user``.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        path = scope["path"]
+        if not path.startswith(PROTECTED_PREFIX) or is_exempt_path(path):
+            await self.app(scope, receive, send)
+            return
+        
+        user = get_current_user(Request(scope))
+        if not user:
+            response = ORJSONResponse(
+                {"detail": "Not authenticated"},
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+            await response(scope, receive, send)
+            return
+        
+        scope.setdefault("state", {})["user"] = user
+        await self.app(scope, receive, send)
@@ -1,10 +1,11 @@
 """Cleanup API endpoints"""
 
+import os
 from typing import Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
-from app.core.cleanup import get_cleanup_manager
+from app.core.cleanup import get_cleanup_manager, remove_paths
 
 router = APIRouter(prefix="/cleanup")
 
@@ -78,17 +79,9 @@ async def cleanup_broken_symlinks(path: Optional[str] = None, dry_run: bool = Tr
     }
     
     if not dry_run:
-        import os
-        deleted = 0
-        errors = []
-        for link in broken:
-            try:
-                os.unlink(link)
-                deleted += 1
-            except Exception as e:
-                errors.append(f"{link}: {e}")
+        deleted, failures = await remove_paths(broken, os.unlink)
         result["deleted"] = deleted
-        result["errors"] = errors
+        result["errors"] = [f"{link}: {e}" for link, e in failures]
     
     return result
 
@@ -112,16 +105,8 @@ async def cleanup_empty_dirs(path: Optional[str] = None, dry_run: bool = True):
     }
     
     if not dry_run:
-        import os
-        deleted = 0
-        errors = []
-        for dir_path in empty:
-            try:
-                os.rmdir(dir_path)
-                deleted += 1
-            except Exception as e:
-                errors.append(f"{dir_path}: {e}")
+        deleted, failures = await remove_paths(empty, os.rmdir)
         result["deleted"] = deleted
-        result["errors"] = errors
+        result["errors"] = [f"{dir_path}: {e}" for dir_path, e in failures]
     
     return result
@@ -1,5 +1,6 @@
 """Folders API endpoints"""
 
+import asyncio
 from typing import Optional
 import base64
 from fastapi import APIRouter, HTTPException
@@ -60,40 +61,29 @@ async def list_folders():
     config = get_config()
     cache = get_cache_manager()
 
-    configured_folders = list(dict.fromkeys(config.paths.source))
+    configured_folders = set(config.paths.source)
 
     db_folders = await cache.get_folders()
     db_folder_map = {f["path"]: f for f in db_folders}
 
+    # Configured folders first (in config order), then DB-only folders
+    all_paths = list(dict.fromkeys([*config.paths.source, *db_folder_map]))
+    counts = await cache.get_file_counts(all_paths)
+
     folders = []
-    for path in configured_folders:
+    for path in all_paths:
         db_info = db_folder_map.get(path, {})
-        files = await cache.get_all_files(path)
         folders.append(
             {
                 "id": _encode_folder_id(path, db_info.get("id")),
                 "path": path,
-                "enabled": db_info.get("enabled", True) if db_info else True,
+                "enabled": db_info.get("enabled", True),
                 "last_scan": db_info.get("last_scan"),
-                "file_count": len(files),
-                "from_config": True,
+                "file_count": counts.get(path, 0),
+                "from_config": path in configured_folders,
             }
         )
 
-    for path, db_info in db_folder_map.items():
-        if path not in configured_folders:
-            files = await cache.get_all_files(path)
-            folders.append(
-                {
-                    "id": _encode_folder_id(path, db_info.get("id")),
-                    "path": path,
-                    "enabled": db_info.get("enabled", True),
-                    "last_scan": db_info.get("last_scan"),
-                    "file_count": len(files),
-                    "from_config": False,
-                }
-            )
-
     return {"folders": folders}
 
 
@@ -107,7 +97,7 @@ async def add_folder(request: AddFolderRequest):
 
     if request.path not in config.paths.source:
         config.paths.source.append(request.path)
-        config.save()
+        await asyncio.to_thread(config.save)
 
     return {
         "message": f"Folder added: {request.path}",
@@ -172,7 +162,7 @@ async def remove_folder_by_id(folder_id: str):
     path = "/" + str(path).lstrip("/")
     if path in config.paths.source:
         config.paths.source.remove(path)
-        config.save()
+        await asyncio.to_thread(config.save)
 
     await cache.remove_folder(path)
 
@@ -206,7 +196,7 @@ async def remove_folder(folder_path: str):
 
     if folder_path in config.paths.source:
         config.paths.source.remove(folder_path)
-        config.save()
+        await asyncio.to_thread(config.save)
 
     await cache.remove_folder(folder_path)
 
@@ -259,8 +249,16 @@ async def browse_openlist(path: str = "/"):
     try:
         items = await client.list_all_files(path)
 
-        dirs = [item for item in items if item.get("is_dir")]
-        files = [item for item in items if not item.get("is_dir")]
+        # Single-pass partition into directories and files
+        dirs: list = []
+        files: list = []
+        add_dir = dirs.append
+        add_file = files.append
+        for item in items:
+            if item.get("is_dir"):
+                add_dir(item)
+            else:
+                add_file(item)
 
         return {
             "path": path,
@@ -1,7 +1,9 @@
 """API router configuration"""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from fastapi.responses import JSONResponse
+import asyncio
+
+from fastapi import APIRouter, HTTPException, status, Request
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 from .scan import router as scan_router
@@ -10,7 +12,6 @@ from .tasks import router as tasks_router
 from .settings import router as settings_router
 from .cleanup import router as cleanup_router
 from .auth import (
-    require_auth,
     login_user,
     delete_session,
     generate_api_token,
@@ -22,10 +23,9 @@ from app.config import (
     env_managed_secret_message,
     get_config,
     is_secret_managed_by_env,
-    reload_config,
 )
 
-api_router = APIRouter(prefix="/api")
+api_router = APIRouter(prefix="/api", default_response_class=ORJSONResponse)
 
 
 # Auth models
@@ -51,7 +51,7 @@ async def login(request: Request, data: LoginRequest):
             detail="Invalid username or password",
         )
 
-    response = JSONResponse(
+    response = ORJSONResponse(
         content={"success": True, "message": "Login successful"}
     )
     response.set_cookie(
@@ -71,7 +71,7 @@ async def logout(request: Request):
     if session_id:
         delete_session(session_id)
 
-    response = JSONResponse(content={"success": True, "message": "Logged out"})
+    response = ORJSONResponse(content={"success": True, "message": "Logged out"})
     response.delete_cookie(SESSION_COOKIE_NAME)
     return response
 
@@ -90,7 +90,7 @@ async def auth_status(request: Request):
     }
 
 
-@api_router.post("/auth/generate-token", dependencies=[Depends(require_auth)])
+@api_router.post("/auth/generate-token")
 async def generate_new_token():
     """Generate and persist a new API token"""
     if is_secret_managed_by_env("web.auth.api_token"):
@@ -103,20 +103,19 @@ async def generate_new_token():
     token = generate_api_token()
     config.web.auth.api_token = token
 
-    if not config.save():
+    if not await asyncio.to_thread(config.save):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to persist API token",
         )
 
-    reload_config()
     return {
         "token": token,
         "message": "API token generated and saved successfully. Save this token now - it may be hidden later.",
     }
 
 
-@api_router.put("/auth/password", dependencies=[Depends(require_auth)])
+@api_router.put("/auth/password")
 async def update_password(data: LoginRequest):
     """Update admin password and store hashed value"""
     if is_secret_managed_by_env("web.auth.password"):
@@ -129,18 +128,17 @@ async def update_password(data: LoginRequest):
     config.web.auth.username = data.username
     config.web.auth.password = hash_password(data.password)
 
-    if not config.save():
+    if not await asyncio.to_thread(config.save):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to persist password",
         )
 
-    reload_config()
     return {"success": True, "message": "Password updated successfully"}
 
 
-# Protected sub-routers with auth dependency
-protected_router = APIRouter(dependencies=[Depends(require_auth)])
+# Protected sub-routers (auth enforced by AuthMiddleware)
+protected_router = APIRouter()
 protected_router.include_router(scan_router, tags=["scan"])
 protected_router.include_router(folders_router, tags=["folders"])
 protected_router.include_router(tasks_router, tags=["tasks"])
@@ -158,7 +156,7 @@ async def health_check():
 
 
 # Status endpoint (protected)
-@api_router.get("/status", dependencies=[Depends(require_auth)])
+@api_router.get("/status")
 async def get_status():
     """Get overall system status"""
     from app.core.cache import get_cache_manager
@@ -1,28 +1,242 @@
 """Settings API endpoints"""
 
+import asyncio
 import os
-import json
+import shutil
+import time
+import aiohttp
+import orjson
 import yaml
+from copy import deepcopy
 from pathlib import Path
-from typing import Optional, List
+from typing import Callable, Dict, List, Literal, Optional, Tuple
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, UploadFile, File
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from pydantic import BaseModel
+from yarl import URL
 
 from app.config import (
+    CONFIG_FILE_LOCK,
+    CONFIG_SECTION_NAMES,
+    SECRET_ENV_BINDINGS,
+    Config,
+    SafeYamlDumper,
+    SafeYamlLoader,
     env_managed_secret_message,
     get_config,
+    get_config_version,
     is_secret_managed_by_env,
     reload_config,
     sanitize_config_for_persist,
+    write_file_atomic,
 )
+from app.core.cache import close_cache_manager, get_cache_manager
+from app.core.emby import get_emby_client
+from app.core.openlist import get_openlist_client
+from app.core.qos import get_qos_limiter
+
+router = APIRouter(prefix="/settings", default_response_class=ORJSONResponse)
+
+# Short-lived cache of masked config views for polling UIs, keyed by section.
+# Entries are also dropped whenever the config version changes (reload/save).
+_CFG_CACHE_TTL = 5.0
+_SECTION_CACHE: Dict[str, Tuple[float, int, dict]] = {}
+
+
+def _cached_section(
+    name: str,
+    builder: Callable[[Config], dict],
+    ttl: float = _CFG_CACHE_TTL,
+) -> dict:
+    """Get builder(config) for a section, rebuilt at most every `ttl` seconds"""
+    now = time.monotonic()
+    version = get_config_version()
+    cached = _SECTION_CACHE.get(name)
+    if cached is None or cached[1] != version or now - cached[0] > ttl:
+        cached = (now, version, builder(get_config()))
+        _SECTION_CACHE[name] = cached
+    return cached[2]
+
+
+def _cached_dict(ttl: float = _CFG_CACHE_TTL) -> dict:
+    """Get config.to_dict(), rebuilt at most every `ttl` seconds"""
+    return _cached_section("all", Config.to_dict, ttl)
+
+
+# Sensitive keys that import must not overwrite with masked/empty values
+_SENSITIVE_KEYS = frozenset(("password", "token", "api_token", "api_key"))
+_MASKED_VALUES = frozenset(("***", ""))
+
+
+def _merge_config(current: dict, imported: dict) -> None:
+    """Deep-merge `imported` into `current` in place, iteratively"""
+    stack = [(current, imported)]
+    while stack:
+        cur, imp = stack.pop()
+        for key, value in imp.items():
+            # Don't overwrite sensitive fields with masked values
+            if key in _SENSITIVE_KEYS and isinstance(value, str) and value in _MASKED_VALUES:
+                continue
+            existing = cur.get(key)
+            if isinstance(value, dict) and isinstance(existing, dict):
+                stack.append((existing, value))
+            else:
+                cur[key] = value
+
+
+# Config file contents keyed by absolute path: (st_mtime_ns, st_size,
+# config version, {kind: parsed}). The version check picks up Config.save()
+# writes, the stat check picks up external edits. All kinds parsed from one
+# read share an entry, so the file is read at most once per change.
+_FILE_CACHE: Dict[str, Tuple[int, int, int, Dict[str, object]]] = {}
+
+
+def _read_config_file(config_path: str, kind: str, parse: Callable[[str], object]):
+    """
+    Read and parse a config file with a single stat() when it is unchanged.
+    
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    path = os.path.abspath(config_path)
+    version = get_config_version()
+    st = os.stat(path)
+    cached = _FILE_CACHE.get(path)
+    if cached is None or cached[:3] != (st.st_mtime_ns, st.st_size, version):
+        with open(path, "r", encoding="utf-8") as f:
+            cached = (st.st_mtime_ns, st.st_size, version, {"text": f.read()})
+        _FILE_CACHE[path] = cached
+    
+    views = cached[3]
+    if kind not in views:
+        views[kind] = parse(views["text"])
+    return views[kind]
+
+
+def _invalidate_config_file(config_path: Optional[str] = None) -> None:
+    """Drop cached contents of a config file (all files if no path given)"""
+    if config_path is None:
+        _FILE_CACHE.clear()
+    else:
+        _FILE_CACHE.pop(os.path.abspath(config_path), None)
+
+
+def _load_yaml_pairs(text: str) -> List[Tuple[yaml.Node, yaml.Node]]:
+    """Compose a YAML document into top-level (key node, value node) pairs"""
+    root = yaml.compose(text, Loader=SafeYamlLoader)
+    if not isinstance(root, yaml.MappingNode):
+        return []
+    return root.value
+
+
+def _dump_yaml_pairs(pairs: List[Tuple[yaml.Node, yaml.Node]]) -> bytes:
+    """Serialize top-level (key node, value node) pairs back to a YAML document"""
+    root = yaml.MappingNode("tag:yaml.org,2002:map", pairs, flow_style=False)
+    return yaml.serialize(root, Dumper=SafeYamlDumper, allow_unicode=True, encoding="utf-8")
 
-router = APIRouter(prefix="/settings")
+
+# Top-level sections holding env-managed secrets; these are always
+# constructed so sanitize_config_for_persist() can blank them
+_SECRET_SECTIONS = frozenset(path[0] for _, path in SECRET_ENV_BINDINGS.values())
+
+
+def _load_config_nodes(config_path: str) -> List[Tuple[yaml.Node, yaml.Node]]:
+    """Compose the config file into (key node, value node) pairs without constructing values"""
+    try:
+        return _read_config_file(config_path, "nodes", _load_yaml_pairs)
+    except FileNotFoundError:
+        return []
+
+
+def _merge_into_config_file(config_path: str, imported_config: dict) -> bool:
+    """
+    Merge imported settings into the YAML config file (blocking I/O).
+    
+    Returns:
+        False if the merge changed nothing (no backup or write was made)
+    """
+    with CONFIG_FILE_LOCK:
+        return _merge_into_config_file_locked(config_path, imported_config)
+
+
+def _merge_into_config_file_locked(config_path: str, imported_config: dict) -> bool:
+    # Compose current config file; only sections touched by the import (or
+    # holding secrets) are constructed, the rest is re-emitted as-is
+    pairs = _load_config_nodes(config_path)
+    wanted = _SECRET_SECTIONS.union(imported_config)
+    loader = SafeYamlLoader("")
+    current_config: dict = {}
+    order: List[Tuple[object, Optional[yaml.Node], Optional[yaml.Node]]] = []
+    for key_node, value_node in pairs:
+        key = key_node.value if isinstance(key_node, yaml.ScalarNode) else None
+        if key in wanted and key not in current_config:
+            current_config[key] = loader.construct_document(value_node)
+            order.append((key, key_node, None))
+        else:
+            order.append((None, key_node, value_node))
+    loader.dispose()
+    
+    # Merge configs (preserve passwords and tokens)
+    before = deepcopy(current_config)
+    _merge_config(current_config, imported_config)
+    if current_config == before:
+        return False
+    
+    # Backup current config: hard-link the existing file (no re-dump),
+    # falling back to a copy where links aren't supported
+    backup_path = f"{config_path}.bak.{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    try:
+        os.link(config_path, backup_path)
+    except FileNotFoundError:
+        pass  # no existing config to back up
+    except OSError:
+        shutil.copy2(config_path, backup_path)
+    
+    current_config = sanitize_config_for_persist(current_config)
+    
+    # Rebuild the document: constructed sections are represented again,
+    # untouched sections keep their original nodes; new keys go last
+    representer = yaml.representer.SafeRepresenter(default_flow_style=False, sort_keys=False)
+    
+    def represent(value):
+        node = representer.represent_data(value)
+        representer.represented_objects = {}
+        representer.object_keeper = []
+        representer.alias_key = None
+        return node
+    
+    root_pairs = []
+    for key, key_node, value_node in order:
+        if value_node is None:
+            value_node = represent(current_config.pop(key))
+        root_pairs.append((key_node, value_node))
+    for key, value in current_config.items():
+        root_pairs.append((represent(key), represent(value)))
+    
+    # Write merged config atomically (temp file + rename)
+    write_file_atomic(config_path, _dump_yaml_pairs(root_pairs))
+    _invalidate_config_file(config_path)
+    return True
+
+
+def _set_fields(target: object, updates: Dict[str, object]) -> bool:
+    """Copy non-None request fields onto a config section (names match); returns True if any changed"""
+    changed = False
+    for name, value in updates.items():
+        if getattr(target, name) != value:
+            setattr(target, name, value)
+            changed = True
+    return changed
 
 
 # ============ Request Models ============
 
+StrmMode = Literal["path", "direct_link"]
+ScanMode = Literal["incremental", "full"]
+ScanDataSource = Literal["cache", "realtime"]
+
+
 class QoSSettings(BaseModel):
     """QoS settings model"""
     qps: Optional[float] = None
@@ -60,7 +274,7 @@ class EmbySettings(BaseModel):
 
 class StrmSettings(BaseModel):
     """STRM generation settings model"""
-    mode: Optional[str] = None  # "path" or "direct_link"
+    mode: Optional[StrmMode] = None
     url_encode: Optional[bool] = None
     output_path: Optional[str] = None
     keep_structure: Optional[bool] = None
@@ -68,8 +282,8 @@ class StrmSettings(BaseModel):
 
 class ScanSettings(BaseModel):
     """Scan mode settings model"""
-    mode: Optional[str] = None  # "incremental" or "full"
-    data_source: Optional[str] = None  # "cache" or "realtime"
+    mode: Optional[ScanMode] = None
+    data_source: Optional[ScanDataSource] = None
 
 
 class WebAuthSettings(BaseModel):
@@ -78,23 +292,48 @@ class WebAuthSettings(BaseModel):
     username: Optional[str] = None
 
 
+class BatchSettings(BaseModel):
+    """Multi-section settings update model"""
+    openlist: Optional[OpenListTokenUpdate] = None
+    telegram: Optional[TelegramSettings] = None
+    emby: Optional[EmbySettings] = None
+    strm: Optional[StrmSettings] = None
+    scan: Optional[ScanSettings] = None
+    qos: Optional[QoSSettings] = None
+
+
 # ============ General Settings ============
 
 @router.get("")
-async def get_settings():
-    """Get current settings"""
-    config = get_config()
-    return config.to_dict()
+async def get_settings(sections: Optional[str] = None):
+    """
+    Get current settings.
+    
+    - **sections**: Optional comma-separated top-level sections to return
+      (e.g. `telegram,emby`); unknown names are ignored
+    """
+    if not sections:
+        return _cached_dict()
+    
+    # Each section is cached on its own, so any combination stays cheap
+    result = {}
+    for name in dict.fromkeys(s.strip() for s in sections.split(",")):
+        if name not in CONFIG_SECTION_NAMES:
+            continue
+        part = _cached_section(f"all.{name}", lambda c, name=name: c.to_partial_dict((name,)))
+        result.update(part)
+    return result
 
 
 @router.post("/reload")
 async def reload_settings():
     """Reload settings from config file"""
     try:
-        config = reload_config()
+        _invalidate_config_file()
+        await asyncio.to_thread(reload_config)
         return {
             "message": "Settings reloaded",
-            "settings": config.to_dict(),
+            "settings": _cached_dict(),
         }
     except Exception as e:
         raise HTTPException(
@@ -103,43 +342,66 @@ async def reload_settings():
         )
 
 
+_EXPORT_DISPOSITION_FMT = "attachment; filename=openlist2strm_config_%s.json"
+
+
 @router.get("/export")
 async def export_config():
     """
     Export current configuration as JSON.
     Sensitive data (passwords, tokens) are masked.
     """
-    config = get_config()
-    config_dict = config.to_dict()
+    config_dict = _cached_dict()
+    now = datetime.now()
     
     # Add export metadata
     export_data = {
         "version": "1.1.0",
-        "exported_at": datetime.now().isoformat(),
+        "exported_at": now.isoformat(),
         "config": config_dict,
     }
     
-    return JSONResponse(
-        content=export_data,
-        headers={
-            "Content-Disposition": f"attachment; filename=openlist2strm_config_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        }
+    return ORJSONResponse(
+        export_data,
+        headers={"Content-Disposition": _EXPORT_DISPOSITION_FMT % now.strftime("%Y%m%d_%H%M%S")},
     )
 
 
 @router.get("/export/full")
 async def export_config_full():
     """
-    Export full configuration file (as YAML string).
+    Export full configuration file as a YAML download.
+    Streamed straight from disk instead of being read into memory.
     WARNING: Contains sensitive data!
     """
     config_path = os.environ.get("CONFIG_PATH", "/config/config.yml")
     
-    if not Path(config_path).exists():
+    try:
+        stat_result = await asyncio.to_thread(os.stat, config_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Config file not found")
     
-    with open(config_path, "r", encoding="utf-8") as f:
-        content = f.read()
+    return FileResponse(
+        config_path,
+        media_type="application/x-yaml",
+        filename=Path(config_path).name,
+        stat_result=stat_result,
+    )
+
+
+@router.get("/export/full/json", deprecated=True)
+async def export_config_full_json():
+    """
+    Export full configuration file (as YAML string wrapped in JSON).
+    Deprecated: use /export/full, which streams the file directly.
+    WARNING: Contains sensitive data!
+    """
+    config_path = os.environ.get("CONFIG_PATH", "/config/config.yml")
+    
+    try:
+        content = await asyncio.to_thread(_read_config_file, config_path, "text", str)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Config file not found")
     
     return {
         "format": "yaml",
@@ -148,6 +410,12 @@ async def export_config_full():
     }
 
 
+def _load_upload_json(f) -> dict:
+    """Parse an uploaded JSON file from its underlying (spooled) file object"""
+    f.seek(0)
+    return orjson.loads(f.read())
+
+
 @router.post("/import")
 async def import_config(file: UploadFile = File(...)):
     """
@@ -157,68 +425,42 @@ async def import_config(file: UploadFile = File(...)):
     if not file.filename.endswith('.json'):
         raise HTTPException(status_code=400, detail="Only JSON files are supported")
     
+    # Parse straight from the spooled temp file in a worker thread
+    try:
+        data = await asyncio.to_thread(_load_upload_json, file.file)
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON format")
+    
+    # Validate structure
+    if not isinstance(data, dict) or "config" not in data:
+        raise HTTPException(status_code=400, detail="Invalid config format: missing 'config' key")
+    imported_config = data["config"]
+    if not isinstance(imported_config, dict):
+        raise HTTPException(status_code=400, detail="Invalid config format: 'config' must be an object")
+    
     try:
-        content = await file.read()
-        data = json.loads(content.decode('utf-8'))
-        
-        # Validate structure
-        if "config" not in data:
-            raise HTTPException(status_code=400, detail="Invalid config format: missing 'config' key")
-        
-        imported_config = data["config"]
-        
-        # Load current config file
         config_path = os.environ.get("CONFIG_PATH", "/config/config.yml")
         
-        if Path(config_path).exists():
-            with open(config_path, "r", encoding="utf-8") as f:
-                current_config = yaml.safe_load(f) or {}
-        else:
-            current_config = {}
-        
-        # Merge configs (preserve passwords and tokens)
-        def merge_config(current, imported):
-            for key, value in imported.items():
-                if key in ['password', 'token', 'api_token', 'api_key']:
-                    # Don't overwrite sensitive fields with masked values
-                    if value in ['***', '']:
-                        continue
-                if isinstance(value, dict) and key in current and isinstance(current[key], dict):
-                    merge_config(current[key], value)
-                else:
-                    current[key] = value
-        
-        merge_config(current_config, imported_config)
-        
-        # Backup current config
-        if Path(config_path).exists():
-            backup_path = f"{config_path}.bak.{datetime.now().strftime('%Y%m%d%H%M%S')}"
-            with open(backup_path, "w", encoding="utf-8") as f:
-                yaml.dump(current_config, f, default_flow_style=False, allow_unicode=True)
-        
-        current_config = sanitize_config_for_persist(current_config)
-
-        # Write merged config
-        with open(config_path, "w", encoding="utf-8") as f:
-            yaml.dump(current_config, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        # Blocking file I/O + YAML work runs in a worker thread
+        changed = await asyncio.to_thread(_merge_into_config_file, config_path, imported_config)
         
         # Reload config
-        reload_config()
+        if changed:
+            await asyncio.to_thread(reload_config)
         
-        return {"message": "Config imported successfully", "merged_keys": list(imported_config.keys())}
+        return {
+            "message": "Config imported successfully" if changed else "Config unchanged",
+            "merged_keys": list(imported_config.keys()),
+            "changed": changed,
+        }
         
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=400, detail="Invalid JSON format")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
 
 
 # ============ Web Auth Settings ============
 
-@router.get("/web-auth")
-async def get_web_auth_settings():
-    """Get web/API authentication settings"""
-    config = get_config()
+def _build_web_auth_settings(config: Config) -> dict:
     return {
         "enabled": config.web.auth.enabled,
         "username": config.web.auth.username,
@@ -226,18 +468,28 @@ async def get_web_auth_settings():
     }
 
 
+@router.get("/web-auth")
+async def get_web_auth_settings():
+    """Get web/API authentication settings"""
+    return _cached_section("web-auth", _build_web_auth_settings)
+
+
 @router.put("/web-auth")
 async def update_web_auth_settings(settings: WebAuthSettings):
     """Update web/API authentication settings"""
     config = get_config()
 
+    updates: Dict[str, object] = {}
     if settings.enabled is not None:
-        config.web.auth.enabled = settings.enabled
-    if settings.username is not None and settings.username.strip():
-        config.web.auth.username = settings.username.strip()
+        updates["enabled"] = settings.enabled
+    username = (settings.username or "").strip()
+    if username:
+        updates["username"] = username
+
+    if not _set_fields(config.web.auth, updates):
+        return {"message": "No changes", "success": True}
 
-    if config.save():
-        reload_config()
+    if await asyncio.to_thread(config.save):
         return {"message": "Web auth settings updated", "success": True}
     else:
         raise HTTPException(status_code=500, detail="Failed to save web auth settings. Check permissions.")
@@ -245,21 +497,28 @@ async def update_web_auth_settings(settings: WebAuthSettings):
 
 # ============ OpenList Settings ============
 
+def _check_openlist_token(data: OpenListTokenUpdate) -> None:
+    if is_secret_managed_by_env("openlist.token"):
+        raise HTTPException(status_code=409, detail=env_managed_secret_message("openlist.token"))
+
+
+def _apply_openlist_token(config: Config, data: OpenListTokenUpdate) -> bool:
+    _check_openlist_token(data)
+    return _set_fields(config.openlist, {"token": data.token})
+
+
 @router.put("/openlist/token")
-async def update_openlist_token(data: OpenListTokenUpdate):
-    """Update OpenList API token"""
-    if is_secret_managed_by_env("openlist.token"):
-        raise HTTPException(status_code=409, detail=env_managed_secret_message("openlist.token"))
-
-    config = get_config()
+async def update_openlist_token(data: OpenListTokenUpdate):
+    """Update OpenList API token"""
+    config = get_config()
     
     # Update current config object
-    config.openlist.token = data.token
+    if not _apply_openlist_token(config, data):
+        return {"message": "No changes", "success": True}
     
-    # Save using robust logic
-    if config.save():
-        # Reload to ensure consistency (though Config.save normally handles it)
-        reload_config()
+    # The live config object is already updated and save() bumps the config
+    # version, so cached views re-read lazily instead of re-parsing here
+    if await asyncio.to_thread(config.save):
         return {"message": "OpenList token updated", "success": True}
     else:
         raise HTTPException(
@@ -268,23 +527,23 @@ async def update_openlist_token(data: OpenListTokenUpdate):
         )
 
 
+async def _probe_openlist() -> dict:
+    """List the OpenList root directory; raises on connection failure"""
+    result = await get_openlist_client().list_files("/")
+    return {
+        "status": "connected",
+        "message": "Successfully connected to OpenList",
+        "provider": result.get("provider"),
+        "items": len(result.get("content", [])),
+    }
+
+
 @router.get("/openlist/test")
 async def test_openlist_connection():
     """Test OpenList connection"""
-    from app.core.openlist import get_openlist_client
-    
-    client = get_openlist_client()
-    
     try:
         # Try to list root directory
-        result = await client.list_files("/")
-        
-        return {
-            "status": "connected",
-            "message": "Successfully connected to OpenList",
-            "provider": result.get("provider"),
-            "items": len(result.get("content", [])),
-        }
+        return await _probe_openlist()
     except Exception as e:
         raise HTTPException(
             status_code=503,
@@ -294,10 +553,7 @@ async def test_openlist_connection():
 
 # ============ Telegram Settings ============
 
-@router.get("/telegram")
-async def get_telegram_settings():
-    """Get Telegram bot settings"""
-    config = get_config()
+def _build_telegram_settings(config: Config) -> dict:
     return {
         "enabled": config.telegram.enabled,
         "token": "***" if config.telegram.token else "",
@@ -311,6 +567,12 @@ async def get_telegram_settings():
     }
 
 
+@router.get("/telegram")
+async def get_telegram_settings():
+    """Get Telegram bot settings"""
+    return _cached_section("telegram", _build_telegram_settings)
+
+
 @router.put("/telegram")
 async def update_telegram_settings(settings: TelegramSettings):
     """
@@ -321,38 +583,84 @@ async def update_telegram_settings(settings: TelegramSettings):
     - **chat_id**: Your Telegram user/chat ID for notifications
     - **allowed_users**: List of user IDs allowed to control the bot
     """
-    config = get_config()
-
-    if settings.enabled is not None:
-        config.telegram.enabled = settings.enabled
-    if settings.token is not None and settings.token != "***":
-        if is_secret_managed_by_env("telegram.token"):
-            raise HTTPException(status_code=409, detail=env_managed_secret_message("telegram.token"))
-        config.telegram.token = settings.token
-    if settings.chat_id is not None:
-        config.telegram.chat_id = settings.chat_id
-    if settings.allowed_users is not None:
-        config.telegram.allowed_users = settings.allowed_users
+    config = get_config()
+    if not _apply_telegram_settings(config, settings):
+        return {"message": "No changes", "success": True}
     
-    # Notify settings
-    if settings.notify_on_scan_start is not None:
-        config.telegram.notify.on_scan_start = settings.notify_on_scan_start
-    if settings.notify_on_scan_complete is not None:
-        config.telegram.notify.on_scan_complete = settings.notify_on_scan_complete
-    if settings.notify_on_error is not None:
-        config.telegram.notify.on_error = settings.notify_on_error
-    
-    if config.save():
+    if await asyncio.to_thread(config.save):
         return {"message": "Telegram settings updated", "success": True}
     else:
         raise HTTPException(status_code=500, detail="Failed to save Telegram settings. Check permissions.")
 
 
+# Request field -> TelegramNotifyConfig attribute
+_TELEGRAM_NOTIFY_FIELDS = {
+    "notify_on_scan_start": "on_scan_start",
+    "notify_on_scan_complete": "on_scan_complete",
+    "notify_on_error": "on_error",
+}
+
+
+def _check_telegram_settings(settings: TelegramSettings) -> None:
+    # "***" is the masked value echoed back by the UI: it leaves the token alone
+    if settings.token not in (None, "***") and is_secret_managed_by_env("telegram.token"):
+        raise HTTPException(status_code=409, detail=env_managed_secret_message("telegram.token"))
+
+
+def _apply_telegram_settings(config: Config, settings: TelegramSettings) -> bool:
+    _check_telegram_settings(settings)
+    updates = settings.model_dump(exclude_none=True)
+    if updates.get("token") == "***":
+        del updates["token"]
+    
+    # Notify settings
+    notify = {
+        attr: updates.pop(field)
+        for field, attr in _TELEGRAM_NOTIFY_FIELDS.items()
+        if field in updates
+    }
+    changed = _set_fields(config.telegram, updates)
+    return _set_fields(config.telegram.notify, notify) or changed
+
+
+# Shared client for Telegram connection tests (keeps the TLS connection alive)
+_tg_client: Optional[aiohttp.ClientSession] = None
+
+
+def _get_tg_client() -> aiohttp.ClientSession:
+    """Get or create the Telegram test HTTP session"""
+    global _tg_client
+    if _tg_client is None or _tg_client.closed:
+        _tg_client = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=10.0),
+            connector=aiohttp.TCPConnector(limit=4),
+        )
+    return _tg_client
+
+
+# (token, parsed getMe URL); rebuilt only when the token changes
+_tg_getme_url: Optional[Tuple[str, URL]] = None
+
+
+def _get_tg_getme_url(token: str) -> URL:
+    """Get the prebuilt getMe URL for a bot token"""
+    global _tg_getme_url
+    if _tg_getme_url is None or _tg_getme_url[0] != token:
+        _tg_getme_url = (token, URL(f"https://api.telegram.org/bot{token}/getMe"))
+    return _tg_getme_url[1]
+
+
+async def close_tg_client():
+    """Close the Telegram test HTTP client"""
+    global _tg_client
+    if _tg_client:
+        await _tg_client.close()
+        _tg_client = None
+
+
 @router.post("/telegram/test")
 async def test_telegram_connection():
     """Test Telegram bot connection"""
-    import httpx
-    
     config = get_config()
     
     if not config.telegram.token:
@@ -362,31 +670,30 @@ async def test_telegram_connection():
         }
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"https://api.telegram.org/bot{config.telegram.token}/getMe"
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("ok"):
-                    bot_info = data.get("result", {})
-                    return {
-                        "success": True,
-                        "bot_username": bot_info.get("username"),
-                        "bot_name": bot_info.get("first_name"),
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": data.get("description", "Unknown error"),
-                    }
+        async with _get_tg_client().get(_get_tg_getme_url(config.telegram.token)) as response:
+            status_code = response.status
+            body = await response.read()
+        
+        if status_code == 200:
+            data = orjson.loads(body)
+            if data.get("ok"):
+                bot_info = data.get("result", {})
+                return {
+                    "success": True,
+                    "bot_username": bot_info.get("username"),
+                    "bot_name": bot_info.get("first_name"),
+                }
             else:
                 return {
                     "success": False,
-                    "error": f"HTTP {response.status_code}",
+                    "error": data.get("description", "Unknown error"),
                 }
-    except httpx.TimeoutException:
+        else:
+            return {
+                "success": False,
+                "error": f"HTTP {status_code}",
+            }
+    except asyncio.TimeoutError:
         return {
             "success": False,
             "error": "连接超时",
@@ -400,10 +707,7 @@ async def test_telegram_connection():
 
 # ============ Emby Settings ============
 
-@router.get("/emby")
-async def get_emby_settings():
-    """Get Emby notification settings"""
-    config = get_config()
+def _build_emby_settings(config: Config) -> dict:
     return {
         "enabled": config.emby.enabled,
         "host": config.emby.host,
@@ -414,37 +718,43 @@ async def get_emby_settings():
     }
 
 
+@router.get("/emby")
+async def get_emby_settings():
+    """Get Emby notification settings"""
+    return _cached_section("emby", _build_emby_settings)
+
+
 @router.put("/emby")
 async def update_emby_settings(settings: EmbySettings):
     """
     Update Emby notification settings.
     """
-    config = get_config()
-
-    if settings.enabled is not None:
-        config.emby.enabled = settings.enabled
-    if settings.host is not None:
-        config.emby.host = settings.host
-    if settings.api_key is not None and settings.api_key != "***":
-        if is_secret_managed_by_env("emby.api_key"):
-            raise HTTPException(status_code=409, detail=env_managed_secret_message("emby.api_key"))
-        config.emby.api_key = settings.api_key
-    if settings.library_id is not None:
-        config.emby.library_id = settings.library_id
-    if settings.notify_on_scan is not None:
-        config.emby.notify_on_scan = settings.notify_on_scan
-    
-    if config.save():
+    config = get_config()
+    if not _apply_emby_settings(config, settings):
+        return {"message": "No changes", "success": True}
+    
+    if await asyncio.to_thread(config.save):
         return {"message": "Emby settings updated", "success": True}
     else:
         raise HTTPException(status_code=500, detail="Failed to save Emby settings. Check permissions.")
 
 
+def _check_emby_settings(settings: EmbySettings) -> None:
+    if settings.api_key not in (None, "***") and is_secret_managed_by_env("emby.api_key"):
+        raise HTTPException(status_code=409, detail=env_managed_secret_message("emby.api_key"))
+
+
+def _apply_emby_settings(config: Config, settings: EmbySettings) -> bool:
+    _check_emby_settings(settings)
+    updates = settings.model_dump(exclude_none=True)
+    if updates.get("api_key") == "***":
+        del updates["api_key"]
+    return _set_fields(config.emby, updates)
+
+
 @router.post("/emby/test")
 async def test_emby_connection():
     """Test Emby connection"""
-    from app.core.emby import get_emby_client
-    
     client = get_emby_client()
     result = await client.test_connection()
     
@@ -457,11 +767,26 @@ async def test_emby_connection():
     return result
 
 
+@router.get("/test/all")
+async def test_all_connections():
+    """Test OpenList and Emby connections concurrently"""
+    openlist, emby = await asyncio.gather(
+        _probe_openlist(),
+        get_emby_client().test_connection(),
+        return_exceptions=True,
+    )
+    
+    if isinstance(openlist, Exception):
+        openlist = {"status": "error", "error": f"Failed to connect to OpenList: {openlist}"}
+    if isinstance(emby, Exception):
+        emby = {"success": False, "error": str(emby)}
+    
+    return {"openlist": openlist, "emby": emby}
+
+
 @router.get("/emby/libraries")
 async def get_emby_libraries():
     """Get list of Emby libraries"""
-    from app.core.emby import get_emby_client
-    
     client = get_emby_client()
     libraries = await client.get_libraries()
     
@@ -470,10 +795,7 @@ async def get_emby_libraries():
 
 # ============ STRM Settings ============
 
-@router.get("/strm")
-async def get_strm_settings():
-    """Get STRM generation settings"""
-    config = get_config()
+def _build_strm_settings(config: Config) -> dict:
     return {
         "mode": config.strm.mode,
         "url_encode": config.strm.url_encode,
@@ -487,26 +809,26 @@ async def get_strm_settings():
     }
 
 
+@router.get("/strm")
+async def get_strm_settings():
+    """Get STRM generation settings"""
+    return _cached_section("strm", _build_strm_settings)
+
+
+def _apply_strm_settings(config: Config, settings: StrmSettings) -> bool:
+    return _set_fields(config.strm, settings.model_dump(exclude_none=True))
+
+
 @router.put("/strm")
 async def update_strm_settings(settings: StrmSettings):
     """
     Update STRM generation settings.
     """
-    if settings.mode is not None and settings.mode not in ["path", "direct_link"]:
-        raise HTTPException(status_code=400, detail="Mode must be 'path' or 'direct_link'")
-    
     config = get_config()
+    if not _apply_strm_settings(config, settings):
+        return {"message": "No changes", "success": True}
     
-    if settings.mode is not None:
-        config.strm.mode = settings.mode
-    if settings.url_encode is not None:
-        config.strm.url_encode = settings.url_encode
-    if settings.output_path is not None:
-        config.strm.output_path = settings.output_path
-    if settings.keep_structure is not None:
-        config.strm.keep_structure = settings.keep_structure
-    
-    if config.save():
+    if await asyncio.to_thread(config.save):
         return {"message": "STRM settings updated", "success": True}
     else:
         raise HTTPException(status_code=500, detail="Failed to save STRM settings. Check permissions.")
@@ -514,10 +836,7 @@ async def update_strm_settings(settings: StrmSettings):
 
 # ============ Scan Settings ============
 
-@router.get("/scan")
-async def get_scan_settings():
-    """Get scan mode settings"""
-    config = get_config()
+def _build_scan_settings(config: Config) -> dict:
     return {
         "mode": config.scan.mode,
         "data_source": config.scan.data_source,
@@ -532,24 +851,26 @@ async def get_scan_settings():
     }
 
 
+@router.get("/scan")
+async def get_scan_settings():
+    """Get scan mode settings"""
+    return _cached_section("scan", _build_scan_settings)
+
+
+def _apply_scan_settings(config: Config, settings: ScanSettings) -> bool:
+    return _set_fields(config.scan, settings.model_dump(exclude_none=True))
+
+
 @router.put("/scan")
 async def update_scan_settings(settings: ScanSettings):
     """
     Update scan mode settings.
     """
-    if settings.mode is not None and settings.mode not in ["incremental", "full"]:
-        raise HTTPException(status_code=400, detail="Mode must be 'incremental' or 'full'")
-    if settings.data_source is not None and settings.data_source not in ["cache", "realtime"]:
-        raise HTTPException(status_code=400, detail="Data source must be 'cache' or 'realtime'")
-    
     config = get_config()
+    if not _apply_scan_settings(config, settings):
+        return {"message": "No changes", "success": True}
     
-    if settings.mode is not None:
-        config.scan.mode = settings.mode
-    if settings.data_source is not None:
-        config.scan.data_source = settings.data_source
-    
-    if config.save():
+    if await asyncio.to_thread(config.save):
         return {"message": "Scan settings updated", "success": True}
     else:
         raise HTTPException(status_code=500, detail="Failed to save scan settings. Check permissions.")
@@ -557,24 +878,26 @@ async def update_scan_settings(settings: ScanSettings):
 
 # ============ QoS Settings ============
 
+def _build_qos_settings(config: Config) -> dict:
+    return {
+        "qps": config.qos.qps,
+        "max_concurrent": config.qos.max_concurrent,
+        "interval": config.qos.interval,
+        "threading_mode": config.qos.threading_mode,
+        "thread_pool_size": config.qos.thread_pool_size,
+        "rate_limit": config.qos.rate_limit,
+    }
+
+
 @router.get("/qos")
 async def get_qos_settings():
     """Get QoS settings"""
-    from app.core.qos import get_qos_limiter
-    
     limiter = get_qos_limiter()
-    config = get_config()
     
     return {
+        # Live limiter stats are never cached
         "stats": limiter.stats,
-        "config": {
-            "qps": config.qos.qps,
-            "max_concurrent": config.qos.max_concurrent,
-            "interval": config.qos.interval,
-            "threading_mode": config.qos.threading_mode,
-            "thread_pool_size": config.qos.thread_pool_size,
-            "rate_limit": config.qos.rate_limit,
-        },
+        "config": _cached_section("qos", _build_qos_settings),
     }
 
 
@@ -583,41 +906,78 @@ async def update_qos_settings(settings: QoSSettings):
     """
     Update QoS settings and persist to config.yml.
     """
-    from app.core.qos import get_qos_limiter
-    
     config = get_config()
     limiter = get_qos_limiter()
+    if not _apply_qos_settings(config, settings):
+        return {"message": "No changes", "stats": limiter.stats, "success": True}
     
+    # Persist to disk
+    if await asyncio.to_thread(config.save):
+        return {
+            "message": "QoS settings updated and persisted",
+            "stats": limiter.stats,
+            "success": True
+        }
+    else:
+        raise HTTPException(status_code=500, detail="Failed to persist QoS settings. Check permissions.")
+
+
+def _apply_qos_settings(config: Config, settings: QoSSettings) -> bool:
+    """Apply QoS settings to config and the live limiter; returns True if any changed"""
     # Update current config object
-    if settings.qps is not None:
-        config.qos.qps = settings.qps
-    if settings.max_concurrent is not None:
-        config.qos.max_concurrent = settings.max_concurrent
-    if settings.interval is not None:
-        config.qos.interval = settings.interval
-    if settings.threading_mode is not None:
-        config.qos.threading_mode = settings.threading_mode
-    if settings.thread_pool_size is not None:
-        config.qos.thread_pool_size = settings.thread_pool_size
-    if settings.rate_limit is not None:
-        config.qos.rate_limit = settings.rate_limit
+    if not _set_fields(config.qos, settings.model_dump(exclude_none=True)):
+        return False
 
     # Update limiter in memory
-    limiter.update_limits(
+    get_qos_limiter().update_limits(
         qps=config.qos.qps,
         max_concurrent=config.qos.max_concurrent,
         interval_ms=config.qos.interval,
     )
+    return True
+
+
+# ============ Batch Settings ============
+
+@router.put("/batch")
+async def update_settings_batch(settings: BatchSettings):
+    """
+    Update several settings sections at once with a single config write.
     
-    # Persist to disk
-    if config.save():
-        return {
-            "message": "QoS settings updated and persisted",
-            "stats": limiter.stats,
-            "success": True
-        }
+    Sections are applied in order: openlist, telegram, emby, strm, scan, qos.
+    Env-managed secrets are checked for every section first, so a rejected
+    batch changes nothing.
+    """
+    if settings.openlist is not None:
+        _check_openlist_token(settings.openlist)
+    if settings.telegram is not None:
+        _check_telegram_settings(settings.telegram)
+    if settings.emby is not None:
+        _check_emby_settings(settings.emby)
+    
+    config = get_config()
+    updated = []
+    
+    if settings.openlist is not None and _apply_openlist_token(config, settings.openlist):
+        updated.append("openlist")
+    if settings.telegram is not None and _apply_telegram_settings(config, settings.telegram):
+        updated.append("telegram")
+    if settings.emby is not None and _apply_emby_settings(config, settings.emby):
+        updated.append("emby")
+    if settings.strm is not None and _apply_strm_settings(config, settings.strm):
+        updated.append("strm")
+    if settings.scan is not None and _apply_scan_settings(config, settings.scan):
+        updated.append("scan")
+    if settings.qos is not None and _apply_qos_settings(config, settings.qos):
+        updated.append("qos")
+    
+    if not updated:
+        return {"message": "No changes", "updated": [], "success": True}
+    
+    if await asyncio.to_thread(config.save):
+        return {"message": "Settings updated", "updated": updated, "success": True}
     else:
-        raise HTTPException(status_code=500, detail="Failed to persist QoS settings. Check permissions.")
+        raise HTTPException(status_code=500, detail="Failed to save settings. Check permissions.")
 
 
 # ============ Cache Settings ============
@@ -625,8 +985,6 @@ async def update_qos_settings(settings: QoSSettings):
 @router.get("/cache/stats")
 async def get_cache_stats():
     """Get cache statistics"""
-    from app.core.cache import get_cache_manager
-    
     cache = get_cache_manager()
     stats = await cache.get_stats()
     
@@ -636,15 +994,10 @@ async def get_cache_stats():
 @router.post("/cache/clear")
 async def clear_cache():
     """Clear all cache data"""
-    from app.core.cache import get_cache_manager, close_cache_manager
-    from pathlib import Path
-    
     # Close current connection
     await close_cache_manager()
     
-    # Delete database file
-    db_path = Path("/data/cache.db")
-    if db_path.exists():
-        os.remove(db_path)
+    # Delete database file (off the event loop; absence is fine)
+    await asyncio.to_thread(Path("/data/cache.db").unlink, missing_ok=True)
     
     return {"message": "Cache cleared"}
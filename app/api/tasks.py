@@ -1,12 +1,27 @@
 """Tasks API endpoints with multi-task management"""
 
-from typing import List, Optional
-from fastapi import APIRouter, HTTPException
+import asyncio
+import time
+from typing import List, Optional, Tuple
+
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
-from app.scheduler import get_scheduler_manager
+from app.config import get_config
+from app.core.scanner import get_scanner
+from app.scheduler import TaskNotFoundError, compile_cron, get_scheduler_manager
+
+router = APIRouter(prefix="/tasks", default_response_class=ORJSONResponse)
 
-router = APIRouter(prefix="/tasks")
+# The scheduler manager is a process-wide singleton; resolve it once
+scheduler = get_scheduler_manager()
+
+# Scheduler versions restart with the process; the prefix keeps old ETags from matching
+_ETAG_PREFIX = f"{int(time.time()):x}"
+# (etag, encoded body) of the last list_tasks response
+_list_cache: Tuple[str, bytes] = ("", b"")
 
 
 class CreateTaskRequest(BaseModel):
@@ -37,22 +52,42 @@ class UpdateScheduleRequest(BaseModel):
     enabled: Optional[bool] = None
 
 
+def _validate_cron(schedule_type: str, schedule_value: Optional[str], cron: Optional[str]) -> None:
+    """Compile a cron schedule up front (cached) so bad expressions fail with 400"""
+    if schedule_type != "cron":
+        return
+    expr = schedule_value or cron
+    if not expr:
+        return
+    try:
+        compile_cron(expr)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cron expression: {e}")
+
+
 # ============ Multi-Task Management ============
 
 @router.get("")
-async def list_tasks():
+async def list_tasks(request: Request):
     """
     List all scheduled tasks.
     
     Returns all tasks with their current status, next run time, etc.
+    The body is encoded once per scheduler version and revalidated via ETag.
     """
+    global _list_cache
     try:
-        scheduler = get_scheduler_manager()
-        tasks = scheduler.get_all_tasks()
-        return {
-            "tasks": tasks if tasks else [],
-            "status": scheduler.status,
-        }
+        etag = f'W/"{_ETAG_PREFIX}.{scheduler.version}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        
+        if _list_cache[0] != etag:
+            # Pure in-memory reads: no thread offload needed. The status already
+            # carries the serialized task list, so build it only once.
+            status = scheduler.status
+            _list_cache = (etag, orjson.dumps({"tasks": status["tasks"], "status": status}))
+        return Response(_list_cache[1], media_type="application/json", headers=headers)
     except Exception as e:
         # Return empty tasks list on error to prevent UI crash
         return {
@@ -66,8 +101,9 @@ async def create_task(request: CreateTaskRequest):
     """
     Create a new scheduled task.
     """
+    _validate_cron(request.schedule_type, request.schedule_value, request.cron)
+    
     try:
-        scheduler = get_scheduler_manager()
         task = await scheduler.create_task(
             name=request.name,
             folder=request.folder,
@@ -79,10 +115,9 @@ async def create_task(request: CreateTaskRequest):
         )
         
         # Save config for persistence
-        from app.config import get_config
         config = get_config()
         config.schedule.tasks.append(task)
-        config.save()
+        await asyncio.to_thread(config.save)
         
         return {
             "message": f"Task created: {task.name}",
@@ -95,7 +130,6 @@ async def create_task(request: CreateTaskRequest):
 @router.get("/{task_id}")
 async def get_task(task_id: str):
     """Get a specific task by ID"""
-    scheduler = get_scheduler_manager()
     task = scheduler.get_task(task_id)
     
     if not task:
@@ -109,8 +143,11 @@ async def update_task(task_id: str, request: UpdateTaskRequest):
     """
     Update task settings.
     """
+    current = scheduler.get_task(task_id)
+    if current is not None:
+        _validate_cron(request.schedule_type or current.schedule_type, request.schedule_value, request.cron)
+    
     try:
-        scheduler = get_scheduler_manager()
         task = await scheduler.update_task(
             task_id=task_id,
             name=request.name,
@@ -125,13 +162,12 @@ async def update_task(task_id: str, request: UpdateTaskRequest):
             raise HTTPException(status_code=404, detail="Task not found")
         
         # Update config for persistence
-        from app.config import get_config
         config = get_config()
         for i, t in enumerate(config.schedule.tasks):
             if t.id == task_id:
                 config.schedule.tasks[i] = task
                 break
-        config.save()
+        await asyncio.to_thread(config.save)
         
         return {
             "message": "Task updated",
@@ -146,13 +182,10 @@ async def update_task(task_id: str, request: UpdateTaskRequest):
 @router.delete("/{task_id}")
 async def delete_task(task_id: str):
     """Delete a scheduled task"""
-    scheduler = get_scheduler_manager()
-    
     # Remove from config first
-    from app.config import get_config
     config = get_config()
     config.schedule.tasks = [t for t in config.schedule.tasks if t.id != task_id]
-    config.save()
+    await asyncio.to_thread(config.save)
     
     success = await scheduler.delete_task(task_id)
     if not success:
@@ -164,7 +197,6 @@ async def delete_task(task_id: str):
 @router.post("/{task_id}/enable")
 async def enable_task(task_id: str):
     """Enable a task"""
-    scheduler = get_scheduler_manager()
     success = await scheduler.enable_task(task_id)
     
     if not success:
@@ -180,7 +212,6 @@ async def enable_task(task_id: str):
 @router.post("/{task_id}/disable")
 async def disable_task(task_id: str):
     """Disable a task"""
-    scheduler = get_scheduler_manager()
     success = await scheduler.disable_task(task_id)
     
     if not success:
@@ -196,7 +227,6 @@ async def disable_task(task_id: str):
 @router.post("/{task_id}/pause")
 async def pause_task(task_id: str):
     """Pause a task (keeps enabled but skips execution)"""
-    scheduler = get_scheduler_manager()
     success = await scheduler.pause_task(task_id)
     
     if not success:
@@ -212,7 +242,6 @@ async def pause_task(task_id: str):
 @router.post("/{task_id}/resume")
 async def resume_task(task_id: str):
     """Resume a paused task"""
-    scheduler = get_scheduler_manager()
     success = await scheduler.resume_task(task_id)
     
     if not success:
@@ -225,17 +254,35 @@ async def resume_task(task_id: str):
     }
 
 
+@router.post("/pause-all")
+async def pause_all_tasks():
+    """Pause all enabled tasks in one scheduler call"""
+    paused = await scheduler.pause_all()
+    return {
+        "message": f"Paused {len(paused)} tasks",
+        "task_ids": paused,
+    }
+
+
+@router.post("/resume-all")
+async def resume_all_tasks():
+    """Resume all paused tasks in one scheduler call"""
+    resumed = await scheduler.resume_all()
+    return {
+        "message": f"Resumed {len(resumed)} tasks",
+        "task_ids": resumed,
+    }
+
+
 @router.post("/{task_id}/run")
 async def run_task_now(task_id: str):
     """Trigger immediate execution of a task"""
-    scheduler = get_scheduler_manager()
-    result = await scheduler.run_task_now(task_id)
-    
-    if not result.get("success"):
-        raise HTTPException(
-            status_code=400 if "not found" in result.get("error", "").lower() else 500,
-            detail=result.get("error", "Unknown error")
-        )
+    try:
+        await scheduler.run_task_now(task_id)
+    except TaskNotFoundError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
     
     return {
         "message": "Task execution started",
@@ -246,8 +293,6 @@ async def run_task_now(task_id: str):
 @router.get("/running")
 async def get_running_tasks():
     """Get currently running tasks"""
-    from app.core.scanner import get_scanner
-    
     scanner = get_scanner()
     
     tasks = []
@@ -1,14 +1,27 @@
 """Configuration management for OpenList2STRM v1.2.0"""
 
+import logging
 import os
-import uuid
-import yaml
+import tempfile
+import secrets
+import threading
 from copy import deepcopy
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union, get_args, get_origin
+from dataclasses import dataclass, field, fields, is_dataclass
 from datetime import datetime
 
+import yaml
+
+# Prefer libyaml-backed C loader/dumper, fall back to pure Python
+try:
+    from yaml import CSafeLoader as SafeYamlLoader, CSafeDumper as SafeYamlDumper
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader as SafeYamlLoader, SafeDumper as SafeYamlDumper
+
+logger = logging.getLogger(__name__)
+
 
 RUNTIME_ENV_FILE = "/etc/media-server/openlist2strm/.env"
 SECRET_ENV_BINDINGS = {
@@ -60,14 +73,76 @@ def _set_nested_value(data: Dict[str, Any], path: tuple[str, ...], value: Any) -
         node[path[-1]] = value
 
 
-def sanitize_config_for_persist(data: Dict[str, Any]) -> Dict[str, Any]:
-    sanitized = deepcopy(data)
+def _blank_env_secrets(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Blank env-managed secrets in data in place"""
     for env_var, path in SECRET_ENV_BINDINGS.values():
         if _get_nonempty_env(env_var) is not None:
-            _set_nested_value(sanitized, path, "")
-    return sanitized
+            _set_nested_value(data, path, "")
+    return data
 
 
+def sanitize_config_for_persist(data: Dict[str, Any]) -> Dict[str, Any]:
+    return _blank_env_secrets(deepcopy(data))
+
+
+# Serializes config file writers (Config.save, settings import merge), which
+# run in worker threads; held across read-modify-write so no update is lost
+CONFIG_FILE_LOCK = threading.RLock()
+
+# Parsed config files: str(path) -> ((st_ino, st_mtime_ns, st_size), data); see Config.load
+_LOAD_CACHE: Dict[str, tuple] = {}
+
+# Requested config path -> file Config.load actually found (possibly a fallback)
+_RESOLVED_PATHS: Dict[str, Path] = {}
+
+_FALLBACK_CONFIG_PATHS = (
+    Path("/config/config.yml"),
+    Path("/config/config.yaml"),
+    Path("config/config.yml"),
+    Path("config.yml"),
+)
+
+
+def _stat_or_none(path: Path) -> Optional[os.stat_result]:
+    try:
+        return path.stat()
+    except FileNotFoundError:
+        return None
+
+
+def _find_config_file(config_path: str) -> Optional[Path]:
+    """Return config_path if it exists, else the first existing fallback path"""
+    path = Path(config_path)
+    if path.exists():
+        return path
+    for alt in _FALLBACK_CONFIG_PATHS:
+        if alt.exists():
+            return alt
+    return None
+
+
+def write_file_atomic(path: Union[str, Path], content: bytes) -> None:
+    """Write to a temp file in the same directory, then os.replace() it into place."""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with open(fd, "wb", buffering=0) as f:
+            f.write(content)
+            os.fsync(f.fileno())
+        try:
+            # mkstemp creates 0600 files; keep the original file's mode
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def _parse_bool(value: Any, default: Optional[bool] = None) -> Optional[bool]:
     """Parse flexible boolean values from env/config."""
     if value is None:
@@ -117,7 +192,7 @@ def _parse_csv_list(value: Any, cast_int: bool = False) -> Optional[List[Any]]:
     return items
 
 
-@dataclass
+@dataclass(slots=True)
 class OpenListConfig:
     """OpenList API configuration"""
     host: str = "http://openlist:5244"
@@ -125,26 +200,30 @@ class OpenListConfig:
     timeout: int = 30
 
 
-@dataclass
+@dataclass(slots=True)
 class PathsConfig:
     """Path configuration"""
     source: List[str] = field(default_factory=lambda: ["/115"])
     output: str = "/strm"
 
 
-@dataclass
+# Shared, immutable default for StrmConfig.extensions
+DEFAULT_STRM_EXTENSIONS: Tuple[str, ...] = (
+    ".mp4", ".mkv", ".avi", ".ts", ".wmv", ".rmvb", ".mov", ".flv", ".m2ts", ".webm"
+)
+
+
+@dataclass(slots=True)
 class StrmConfig:
     """STRM file configuration"""
-    extensions: List[str] = field(default_factory=lambda: [
-        ".mp4", ".mkv", ".avi", ".ts", ".wmv", ".rmvb", ".mov", ".flv", ".m2ts", ".webm"
-    ])
+    extensions: List[str] = field(default_factory=lambda: list(DEFAULT_STRM_EXTENSIONS))
     keep_structure: bool = True
     url_encode: bool = True
     mode: str = "path"  # "path" or "direct_link"
     output_path: str = "/strm"  # Local STRM output path
 
 
-@dataclass
+@dataclass(slots=True)
 class QoSConfig:
     """QoS rate limiting configuration"""
     qps: float = 5.0
@@ -172,13 +251,36 @@ class TaskConfig:
     
     def __post_init__(self):
         if not self.id:
-            self.id = f"task_{uuid.uuid4().hex[:8]}"
+            self.id = f"task_{secrets.token_hex(4)}"
         
         # If schedule_type is not set but cron is, try to infer (basic migration)
         if self.schedule_type == "cron" and not self.schedule_value:
             self.schedule_value = self.cron
     
+    # Class-wide counter bumped on every field change of any task (not a field)
+    revision = 0
+    # (revision, dict) from the last to_dict(); instances shadow this default
+    _dict_cache = None
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Bump after the write: any cached to_dict() result becomes stale
+        object.__setattr__(self, name, value)
+        TaskConfig.revision += 1
+    
     def to_dict(self) -> Dict[str, Any]:
+        """Serialized task; cached until a task field changes, treat as read-only"""
+        cached = self._dict_cache
+        if cached is not None and cached[0] == TaskConfig.revision:
+            return cached[1]
+        # Saves build this in worker threads while the loop may set fields.
+        # Tagging the result with the revision read *before* building means
+        # a dict built from half-old values is already stale on the next read.
+        revision = TaskConfig.revision
+        data = self._build_dict()
+        object.__setattr__(self, "_dict_cache", (revision, data))
+        return data
+    
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
             "name": self.name,
@@ -195,22 +297,24 @@ class TaskConfig:
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "TaskConfig":
-        return cls(
-            id=data.get("id", ""),
-            name=data.get("name", ""),
-            folder=data.get("folder", ""),
-            cron=data.get("cron", "0 2 * * *"),
-            schedule_type=data.get("schedule_type", "cron"),
-            schedule_value=data.get("schedule_value", ""),
-            enabled=data.get("enabled", True),
-            paused=data.get("paused", False),
-            one_time=data.get("one_time", False),
-            last_run=data.get("last_run"),
-            next_run=data.get("next_run"),
-        )
+        names = _field_names(cls)
+        # Tasks written by Config.save carry every field: build positionally
+        if isinstance(data, dict) and data.keys() >= _TASK_FIELD_SET:
+            values = [data[name] for name in names]
+            if data["id"] and (data["schedule_value"] or data["schedule_type"] != "cron"):
+                # __post_init__ would change nothing and every field is given,
+                # so fill the instance dict directly, skipping __setattr__ too
+                task = cls.__new__(cls)
+                task.__dict__.update(zip(names, values))
+                return task
+            return cls(*values)
+        return _build_dataclass(cls, data)
 
 
-@dataclass
+_TASK_FIELD_SET = frozenset(f.name for f in fields(TaskConfig))
+
+
+@dataclass(slots=True)
 class ScheduleConfig:
     """Schedule configuration (legacy + multi-task)"""
     enabled: bool = False
@@ -219,21 +323,21 @@ class ScheduleConfig:
     tasks: List[TaskConfig] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanConfig:
     """Scan mode configuration"""
     mode: str = "incremental"  # "incremental" or "full"
     data_source: str = "cache"  # "cache" or "realtime"
 
 
-@dataclass
+@dataclass(slots=True)
 class IncrementalConfig:
     """Incremental update configuration"""
     enabled: bool = True
     check_method: str = "mtime"  # mtime | size | both
 
 
-@dataclass
+@dataclass(slots=True)
 class TelegramNotifyConfig:
     """Telegram notification settings"""
     on_scan_start: bool = True
@@ -241,7 +345,7 @@ class TelegramNotifyConfig:
     on_error: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class TelegramConfig:
     """Telegram bot configuration"""
     enabled: bool = False
@@ -252,7 +356,7 @@ class TelegramConfig:
     notify: TelegramNotifyConfig = field(default_factory=TelegramNotifyConfig)
 
 
-@dataclass
+@dataclass(slots=True)
 class EmbyConfig:
     """Emby notification configuration"""
     enabled: bool = False
@@ -262,7 +366,7 @@ class EmbyConfig:
     notify_on_scan: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class WebAuthConfig:
     """Web authentication configuration"""
     enabled: bool = True  # Auth enabled by default
@@ -271,7 +375,7 @@ class WebAuthConfig:
     api_token: str = ""  # API token for programmatic access
 
 
-@dataclass
+@dataclass(slots=True)
 class WebConfig:
     """Web interface configuration"""
     enabled: bool = True
@@ -279,7 +383,7 @@ class WebConfig:
     auth: WebAuthConfig = field(default_factory=WebAuthConfig)
 
 
-@dataclass
+@dataclass(slots=True)
 class LoggingConfig:
     """Logging configuration"""
     level: str = "INFO"
@@ -287,7 +391,91 @@ class LoggingConfig:
     colorize: bool = True
 
 
-@dataclass
+# Per-field coercions on top of the generic dict -> dataclass loader
+_FIELD_COERCIONS: Dict[Tuple[type, str], Callable[[Any], Any]] = {
+    # paths.source may be written as a comma-separated string
+    (PathsConfig, "source"): lambda v: (_parse_csv_list(v) or PathsConfig().source) if isinstance(v, str) else v,
+    (TelegramConfig, "topic_id"): str,
+    (ScheduleConfig, "tasks"): lambda v: [TaskConfig.from_dict(t) for t in v or ()],
+}
+
+
+@lru_cache(maxsize=None)
+def _field_plan(cls: type) -> Tuple[Tuple[str, Optional[Callable[[Any], Any]]], ...]:
+    """(field name, value converter or None) for each field of cls, computed once per class"""
+    plan = []
+    for f in fields(cls):
+        convert = _FIELD_COERCIONS.get((cls, f.name))
+        if convert is None:
+            args = get_args(f.type)
+            if is_dataclass(f.type):
+                convert = lambda v, sub=f.type: _build_dataclass(sub, v)
+            elif get_origin(f.type) is list and args and is_dataclass(args[0]):
+                convert = lambda v, sub=args[0]: [_build_dataclass(sub, item) for item in v or ()]
+        plan.append((f.name, convert))
+    return tuple(plan)
+
+
+def _build_dataclass(cls: type, data: Any) -> Any:
+    """Build a config dataclass from a (partial) dict; missing keys keep the class defaults"""
+    if not isinstance(data, dict):
+        data = {}
+    kwargs = {}
+    for name, convert in _field_plan(cls):
+        if name in data:
+            value = data[name]
+            kwargs[name] = value if convert is None else convert(value)
+    return cls(**kwargs)
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    return tuple(f.name for f in fields(cls))
+
+
+def _to_plain(value: Any) -> Any:
+    """Recursively convert config dataclasses (and lists/dicts of them) to plain data"""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, list):
+        return [_to_plain(item) for item in value]
+    if isinstance(value, TaskConfig):
+        # Reuse the task's cached dict; its values are all scalars
+        return dict(value.to_dict())
+    if isinstance(value, dict):
+        return {key: _to_plain(item) for key, item in value.items()}
+    if is_dataclass(value):
+        return {name: _to_plain(getattr(value, name)) for name in _field_names(type(value))}
+    return value
+
+
+def _merge_into(target: Any, updates: Dict[str, Any]) -> None:
+    """Apply a partial dict onto a config dataclass in place; nested sections are merged, not replaced"""
+    for name, convert in _field_plan(type(target)):
+        if name not in updates:
+            continue
+        value = updates[name]
+        current = getattr(target, name)
+        if is_dataclass(current) and isinstance(value, dict):
+            _merge_into(current, value)
+        else:
+            setattr(target, name, value if convert is None else convert(value))
+
+
+def _mask_secrets(section: str, data: Any) -> Any:
+    """Mask credentials in a plain top-level section for API responses (in place)"""
+    if section == "telegram":
+        data["token"] = "***" if data["token"] else ""
+    elif section == "emby":
+        data["api_key"] = "***" if data["api_key"] else ""
+    elif section == "web":
+        auth = data["auth"]
+        del auth["password"]
+        auth["api_token_configured"] = bool(auth.pop("api_token"))
+    return data
+
+
+@dataclass(slots=True)
 class Config:
     """Main configuration class"""
     openlist: OpenListConfig = field(default_factory=OpenListConfig)
@@ -406,141 +594,7 @@ class Config:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Config":
         """Create config from dictionary"""
-        data = cls._migrate_legacy_dict(data)
-        config = cls()
-        
-        # OpenList config
-        if "openlist" in data:
-            ol = data["openlist"]
-            config.openlist = OpenListConfig(
-                host=ol.get("host", config.openlist.host),
-                token=ol.get("token", config.openlist.token),
-                timeout=ol.get("timeout", config.openlist.timeout),
-            )
-        
-        # Paths config
-        if "paths" in data:
-            p = data["paths"]
-            source_paths = p.get("source", config.paths.source)
-            if isinstance(source_paths, str):
-                source_paths = _parse_csv_list(source_paths) or config.paths.source
-            config.paths = PathsConfig(
-                source=source_paths,
-                output=p.get("output", config.paths.output),
-            )
-        
-        # Path mapping
-        if "path_mapping" in data:
-            config.path_mapping = data["path_mapping"]
-        
-        # STRM config
-        if "strm" in data:
-            s = data["strm"]
-            config.strm = StrmConfig(
-                extensions=s.get("extensions", config.strm.extensions),
-                keep_structure=s.get("keep_structure", config.strm.keep_structure),
-                url_encode=s.get("url_encode", config.strm.url_encode),
-                mode=s.get("mode", config.strm.mode),
-                output_path=s.get("output_path", config.strm.output_path),
-            )
-        
-        # QoS config
-        if "qos" in data:
-            q = data["qos"]
-            config.qos = QoSConfig(
-                qps=q.get("qps", config.qos.qps),
-                max_concurrent=q.get("max_concurrent", config.qos.max_concurrent),
-                interval=q.get("interval", config.qos.interval),
-                threading_mode=q.get("threading_mode", config.qos.threading_mode),
-                thread_pool_size=q.get("thread_pool_size", config.qos.thread_pool_size),
-                rate_limit=q.get("rate_limit", config.qos.rate_limit),
-            )
-        
-        # Schedule config with multi-task support
-        if "schedule" in data:
-            sc = data["schedule"]
-            tasks = []
-            if "tasks" in sc:
-                for t in sc["tasks"]:
-                    tasks.append(TaskConfig.from_dict(t))
-            config.schedule = ScheduleConfig(
-                enabled=sc.get("enabled", config.schedule.enabled),
-                cron=sc.get("cron", config.schedule.cron),
-                on_startup=sc.get("on_startup", config.schedule.on_startup),
-                tasks=tasks,
-            )
-        
-        # Scan config
-        if "scan" in data:
-            sc = data["scan"]
-            config.scan = ScanConfig(
-                mode=sc.get("mode", config.scan.mode),
-                data_source=sc.get("data_source", config.scan.data_source),
-            )
-        
-        # Incremental config
-        if "incremental" in data:
-            inc = data["incremental"]
-            config.incremental = IncrementalConfig(
-                enabled=inc.get("enabled", config.incremental.enabled),
-                check_method=inc.get("check_method", config.incremental.check_method),
-            )
-        
-        # Telegram config
-        if "telegram" in data:
-            tg = data["telegram"]
-            notify_data = tg.get("notify", {})
-            notify = TelegramNotifyConfig(
-                on_scan_start=notify_data.get("on_scan_start", True),
-                on_scan_complete=notify_data.get("on_scan_complete", True),
-                on_error=notify_data.get("on_error", True),
-            )
-            config.telegram = TelegramConfig(
-                enabled=tg.get("enabled", config.telegram.enabled),
-                token=tg.get("token", config.telegram.token),
-                chat_id=tg.get("chat_id", config.telegram.chat_id),
-                topic_id=str(tg.get("topic_id", config.telegram.topic_id)),
-                allowed_users=tg.get("allowed_users", config.telegram.allowed_users),
-                notify=notify,
-            )
-        
-        # Emby config
-        if "emby" in data:
-            em = data["emby"]
-            config.emby = EmbyConfig(
-                enabled=em.get("enabled", config.emby.enabled),
-                host=em.get("host", config.emby.host),
-                api_key=em.get("api_key", config.emby.api_key),
-                library_id=em.get("library_id", config.emby.library_id),
-                notify_on_scan=em.get("notify_on_scan", config.emby.notify_on_scan),
-            )
-        
-        # Web config
-        if "web" in data:
-            w = data["web"]
-            auth_data = w.get("auth", {})
-            auth = WebAuthConfig(
-                enabled=auth_data.get("enabled", True),
-                username=auth_data.get("username", "admin"),
-                password=auth_data.get("password", ""),
-                api_token=auth_data.get("api_token", ""),
-            )
-            config.web = WebConfig(
-                enabled=w.get("enabled", config.web.enabled),
-                port=w.get("port", config.web.port),
-                auth=auth,
-            )
-        
-        # Logging config
-        if "logging" in data:
-            log = data["logging"]
-            config.logging = LoggingConfig(
-                level=log.get("level", config.logging.level),
-                retention_days=log.get("retention_days", config.logging.retention_days),
-                colorize=log.get("colorize", config.logging.colorize),
-            )
-        
-        return config
+        return _build_dataclass(cls, cls._migrate_legacy_dict(data))
     
     @classmethod
     def load(cls, config_path: Optional[str] = None) -> "Config":
@@ -548,119 +602,59 @@ class Config:
         if config_path is None:
             config_path = os.environ.get("CONFIG_PATH", "/config/config.yml")
         
-        path = Path(config_path)
-        if not path.exists():
-            # Try alternative paths
-            alt_paths = [
-                Path("/config/config.yml"),
-                Path("/config/config.yaml"),
-                Path("config/config.yml"),
-                Path("config.yml"),
-            ]
-            for alt in alt_paths:
-                if alt.exists():
-                    path = alt
-                    break
-            else:
+        # Reuse the previously resolved file while it still exists
+        path = _RESOLVED_PATHS.get(config_path)
+        st = _stat_or_none(path) if path is not None else None
+        if st is None:
+            path = _find_config_file(config_path)
+            st = _stat_or_none(path) if path is not None else None
+            if st is None:
                 # Return default config if no file found
                 config = cls()
                 config._apply_env_overrides()
                 return config
+            _RESOLVED_PATHS[config_path] = path
         
-        # Try to load config with error handling for encoding issues
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
-        except UnicodeDecodeError:
-            # Try with different encoding or ignore errors
-            print(f"Warning: Config file has encoding issues, trying with error handling")
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                data = yaml.safe_load(f) or {}
-        except yaml.YAMLError as e:
-            print(f"Warning: Failed to parse config file: {e}")
-            config = cls()
-            config._apply_env_overrides()
-            return config
+        # Reuse the parsed file while it is unchanged on disk. Atomic writes
+        # replace the inode, so st_ino catches rewrites that keep the same
+        # size within one mtime tick.
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        cached = _LOAD_CACHE.get(str(path))
+        if cached is not None and cached[0] == key:
+            data = cached[1]
+        else:
+            # Hand the raw bytes to the loader; it decodes UTF-8 itself
+            raw = path.read_bytes()
+            try:
+                try:
+                    data = yaml.load(raw, Loader=SafeYamlLoader) or {}
+                except yaml.reader.ReaderError:
+                    # Try again with undecodable bytes dropped
+                    logger.warning("Config file has encoding issues, trying with error handling")
+                    data = yaml.load(raw.decode("utf-8", errors="ignore"), Loader=SafeYamlLoader) or {}
+            except yaml.YAMLError as e:
+                logger.warning(f"Failed to parse config file: {e}")
+                config = cls()
+                config._apply_env_overrides()
+                return config
+            _LOAD_CACHE[str(path)] = (key, data)
         
-        config = cls.from_dict(data)
+        # from_dict keeps (and legacy migration edits) nested values, so hand
+        # it a private copy and keep the cached parse pristine
+        config = cls.from_dict(deepcopy(data))
         config._apply_env_overrides()
         return config
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert config to dictionary"""
+        return self.to_partial_dict(_CONFIG_SECTIONS)
+    
+    def to_partial_dict(self, sections: Iterable[str]) -> Dict[str, Any]:
+        """Convert only the given top-level sections to a dictionary; unknown names are skipped"""
         return {
-            "openlist": {
-                "host": self.openlist.host,
-                "token": self.openlist.token,
-                "timeout": self.openlist.timeout,
-            },
-            "paths": {
-                "source": self.paths.source,
-                "output": self.paths.output,
-            },
-            "path_mapping": self.path_mapping,
-            "strm": {
-                "extensions": self.strm.extensions,
-                "keep_structure": self.strm.keep_structure,
-                "url_encode": self.strm.url_encode,
-                "mode": self.strm.mode,
-                "output_path": self.strm.output_path,
-            },
-            "qos": {
-                "qps": self.qos.qps,
-                "max_concurrent": self.qos.max_concurrent,
-                "interval": self.qos.interval,
-                "threading_mode": self.qos.threading_mode,
-                "thread_pool_size": self.qos.thread_pool_size,
-                "rate_limit": self.qos.rate_limit,
-            },
-            "schedule": {
-                "enabled": self.schedule.enabled,
-                "cron": self.schedule.cron,
-                "on_startup": self.schedule.on_startup,
-                "tasks": [t.to_dict() for t in self.schedule.tasks],
-            },
-            "scan": {
-                "mode": self.scan.mode,
-                "data_source": self.scan.data_source,
-            },
-            "incremental": {
-                "enabled": self.incremental.enabled,
-                "check_method": self.incremental.check_method,
-            },
-            "telegram": {
-                "enabled": self.telegram.enabled,
-                "token": "***" if self.telegram.token else "",
-                "chat_id": self.telegram.chat_id,
-                "topic_id": self.telegram.topic_id,
-                "allowed_users": self.telegram.allowed_users,
-                "notify": {
-                    "on_scan_start": self.telegram.notify.on_scan_start,
-                    "on_scan_complete": self.telegram.notify.on_scan_complete,
-                    "on_error": self.telegram.notify.on_error,
-                },
-            },
-            "emby": {
-                "enabled": self.emby.enabled,
-                "host": self.emby.host,
-                "api_key": "***" if self.emby.api_key else "",
-                "library_id": self.emby.library_id,
-                "notify_on_scan": self.emby.notify_on_scan,
-            },
-            "web": {
-                "enabled": self.web.enabled,
-                "port": self.web.port,
-                "auth": {
-                    "enabled": self.web.auth.enabled,
-                    "username": self.web.auth.username,
-                    "api_token_configured": bool(self.web.auth.api_token),
-                },
-            },
-            "logging": {
-                "level": self.logging.level,
-                "retention_days": self.logging.retention_days,
-                "colorize": self.logging.colorize,
-            },
+            name: _mask_secrets(name, _to_plain(getattr(self, name)))
+            for name in sections
+            if name in CONFIG_SECTION_NAMES
         }
     
     def save(self, config_path: Optional[str] = None) -> bool:
@@ -673,123 +667,78 @@ class Config:
         
         try:
             # Ensure directory exists
-            if not directory.exists():
-                directory.mkdir(parents=True, exist_ok=True)
-            
-            # Check if directory is writable, try to fix if not
-            if not os.access(directory, os.W_OK):
-                try:
-                    # Attempt to add write permission for the current user/group
-                    # This might fail if app isn't running as root/owner
-                    current_mode = directory.stat().st_mode
-                    os.chmod(directory, current_mode | 0o200) 
-                except Exception as e:
-                    print(f"Warning: Cannot fix directory permissions for {directory}: {e}")
-            
-            # If file exists, check writability
-            if path.exists() and not os.access(path, os.W_OK):
+            directory.mkdir(parents=True, exist_ok=True)
+
+            # Snapshot, dump and write under one lock hold, so a save that
+            # started earlier can never overwrite a newer file with stale data
+            with CONFIG_FILE_LOCK:
+                # Build save dict (with full credentials); _to_plain returns fresh
+                # containers, so env-managed secrets can be blanked without a copy
+                save_data = _blank_env_secrets(_to_plain(self))
+                content = yaml.dump(
+                    save_data,
+                    Dumper=SafeYamlDumper,
+                    default_flow_style=False,
+                    allow_unicode=True,
+                    sort_keys=False,
+                    encoding="utf-8",
+                )
+                try:
+                    unchanged = path.read_bytes() == content
+                except FileNotFoundError:
+                    unchanged = False
+                if unchanged:
+                    # Nothing to write, but callers may have mutated the live
+                    # config in place, so derived caches must still refresh
+                    _bump_config_version()
+                    return True
                 try:
-                    current_mode = path.stat().st_mode
-                    os.chmod(path, current_mode | 0o200)
-                except Exception as e:
-                    print(f"Warning: Cannot fix file permissions for {path}: {e}")
-
-            # Build save dict (with full credentials)
-            save_data = {
-                "openlist": {
-                    "host": self.openlist.host,
-                    "token": self.openlist.token,
-                    "timeout": self.openlist.timeout,
-                },
-                "paths": {
-                    "source": self.paths.source,
-                    "output": self.paths.output,
-                },
-                "path_mapping": self.path_mapping,
-                "strm": {
-                    "extensions": self.strm.extensions,
-                    "keep_structure": self.strm.keep_structure,
-                    "url_encode": self.strm.url_encode,
-                    "mode": self.strm.mode,
-                    "output_path": self.strm.output_path,
-                },
-                "qos": {
-                    "qps": self.qos.qps,
-                    "max_concurrent": self.qos.max_concurrent,
-                    "interval": self.qos.interval,
-                    "threading_mode": self.qos.threading_mode,
-                    "thread_pool_size": self.qos.thread_pool_size,
-                    "rate_limit": self.qos.rate_limit,
-                },
-                "schedule": {
-                    "enabled": self.schedule.enabled,
-                    "cron": self.schedule.cron,
-                    "on_startup": self.schedule.on_startup,
-                    "tasks": [t.to_dict() for t in self.schedule.tasks],
-                },
-                "scan": {
-                    "mode": self.scan.mode,
-                    "data_source": self.scan.data_source,
-                },
-                "incremental": {
-                    "enabled": self.incremental.enabled,
-                    "check_method": self.incremental.check_method,
-                },
-                "telegram": {
-                    "enabled": self.telegram.enabled,
-                    "token": self.telegram.token,
-                    "chat_id": self.telegram.chat_id,
-                    "topic_id": self.telegram.topic_id,
-                    "allowed_users": self.telegram.allowed_users,
-                    "notify": {
-                        "on_scan_start": self.telegram.notify.on_scan_start,
-                        "on_scan_complete": self.telegram.notify.on_scan_complete,
-                        "on_error": self.telegram.notify.on_error,
-                    },
-                },
-                "emby": {
-                    "enabled": self.emby.enabled,
-                    "host": self.emby.host,
-                    "api_key": self.emby.api_key,
-                    "library_id": self.emby.library_id,
-                    "notify_on_scan": self.emby.notify_on_scan,
-                },
-                "web": {
-                    "enabled": self.web.enabled,
-                    "port": self.web.port,
-                    "auth": {
-                        "enabled": self.web.auth.enabled,
-                        "username": self.web.auth.username,
-                        "password": self.web.auth.password,
-                        "api_token": self.web.auth.api_token,
-                    },
-                },
-                "logging": {
-                    "level": self.logging.level,
-                    "retention_days": self.logging.retention_days,
-                    "colorize": self.logging.colorize,
-                },
-            }
-            
-            save_data = sanitize_config_for_persist(save_data)
-
-            with open(path, "w", encoding="utf-8") as f:
-                yaml.dump(save_data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+                    write_file_atomic(path, content)
+                except PermissionError:
+                    # The atomic write only needs a writable directory. Attempt to
+                    # add write permission for the current user/group and retry once;
+                    # this might fail if app isn't running as root/owner
+                    try:
+                        os.chmod(directory, directory.stat().st_mode | 0o200)
+                    except Exception as e:
+                        logger.warning(f"Cannot fix directory permissions for {directory}: {e}")
+                    write_file_atomic(path, content)
+                _LOAD_CACHE.clear()
+                # The save may have created the primary file a fallback stood in for
+                _RESOLVED_PATHS.clear()
+                _bump_config_version()
             
-            # Verify saved
-            if path.exists() and path.stat().st_size > 0:
-                print(f"Config saved successfully to {path}")
-                return True
-            return False
+            logger.info(f"Config saved successfully to {path}")
+            return True
         except Exception as e:
-            error_msg = f"Critical Error: Failed to save config to {config_path}: {str(e)}"
-            print(error_msg)
+            logger.exception(f"Failed to save config to {config_path}: {e}")
             return False
 
 
+# Top-level sections of Config.to_dict(), in output order
+_CONFIG_SECTIONS: Tuple[str, ...] = tuple(f.name for f in fields(Config))
+
+
+CONFIG_SECTION_NAMES = frozenset(_CONFIG_SECTIONS)
+
+
 # Global config instance
 _config: Optional[Config] = None
 
+# Bumped whenever the live config is replaced or persisted, so hot paths can
+# cache derived values and cheaply detect when they go stale.
+_config_version = 0
+
+
+def _bump_config_version() -> None:
+    global _config_version
+    _config_version += 1
+
+
+def get_config_version() -> int:
+    """Get the current configuration version counter"""
+    return _config_version
+
 
 def get_config() -> Config:
     """Get the global configuration instance"""
@@ -803,6 +752,7 @@ def reload_config() -> Config:
     """Reload configuration from file"""
     global _config
     _config = Config.load()
+    _bump_config_version()
     return _config
 
 
@@ -812,8 +762,12 @@ def update_config(updates: Dict[str, Any]) -> Config:
     if _config is None:
         _config = Config.load()
     
-    # Apply updates to current config
-    new_config = Config.from_dict({**_config.to_dict(), **updates})
+    # Apply updates to a copy of the current config, field by field
+    new_config = deepcopy(_config)
+    _merge_into(new_config, Config._migrate_legacy_dict(updates))
     new_config.save()
     _config = new_config
+    # save() bumped the version while _config still pointed at the old object;
+    # bump again after the swap so nothing stays cached from the old instance
+    _bump_config_version()
     return _config
@@ -232,7 +232,41 @@ class CacheManager:
                 )
             rows = await cursor.fetchall()
             return [dict(row) for row in rows]
-    
+
+    async def get_file_counts(self, folders: List[str]) -> Dict[str, int]:
+        """
+        Count cached files under each folder in a single table scan.
+
+        Uses the same prefix match as get_all_files, but only returns
+        counts instead of materializing every row.
+
+        Args:
+            folders: Folder prefixes to count
+
+        Returns:
+            Dict mapping folder -> file count
+        """
+        folders = list(dict.fromkeys(folders))
+        counts: Dict[str, int] = {}
+        if not folders:
+            return counts
+
+        db = await self._get_db()
+        async with self._lock:
+            # Stay under SQLite's default 999 bound-variable limit
+            for start in range(0, len(folders), 900):
+                chunk = folders[start:start + 900]
+                columns = ", ".join("COALESCE(SUM(path LIKE ?), 0)" for _ in chunk)
+                cursor = await db.execute(
+                    f"SELECT {columns} FROM file_cache WHERE is_dir = 0",
+                    tuple(f"{folder}%" for folder in chunk),
+                )
+                row = await cursor.fetchone()
+                for folder, count in zip(chunk, row):
+                    counts[folder] = count
+
+        return counts
+
     async def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         db = await self._get_db()
@@ -1,15 +1,93 @@
 """Cleanup utilities for maintaining local-cloud consistency"""
 
+import asyncio
 import logging
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 from app.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Max directories being cleaned in worker threads at once
+REMOVE_CONCURRENCY = 32
+
+_O_DIRECTORY = getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_CLOEXEC", 0)
+
+
+def _remove_in_dir(
+    dirname: str,
+    names: List[str],
+    remover: Callable[..., None],
+) -> Tuple[int, List[Tuple[str, Exception]]]:
+    """Remove entries of one directory, resolving the parent only once via dir_fd"""
+    deleted = 0
+    failures: List[Tuple[str, Exception]] = []
+
+    dir_fd = None
+    if remover in os.supports_dir_fd:
+        try:
+            dir_fd = os.open(dirname, os.O_RDONLY | _O_DIRECTORY)
+        except OSError:
+            dir_fd = None
+
+    try:
+        for name in names:
+            try:
+                if dir_fd is not None:
+                    remover(name, dir_fd=dir_fd)
+                else:
+                    remover(os.path.join(dirname, name))
+                deleted += 1
+            except Exception as e:
+                failures.append((os.path.join(dirname, name), e))
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+    return deleted, failures
+
+
+async def remove_paths(
+    paths: List[str],
+    remover: Callable[..., None] = os.unlink,
+    concurrency: int = REMOVE_CONCURRENCY,
+) -> Tuple[int, List[Tuple[str, Exception]]]:
+    """
+    Remove paths in worker threads without blocking the event loop.
+    
+    Paths are grouped by parent directory; each group runs in one thread.
+    
+    Args:
+        paths: Paths to remove
+        remover: os.unlink for files/symlinks, os.rmdir for empty directories
+        concurrency: Max directory groups processed at once
+        
+    Returns:
+        (deleted count, list of (path, error) for failures)
+    """
+    groups: Dict[str, List[str]] = {}
+    for path in paths:
+        dirname, name = os.path.split(path)
+        groups.setdefault(dirname, []).append(name)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(dirname: str, names: List[str]):
+        async with semaphore:
+            return await asyncio.to_thread(_remove_in_dir, dirname, names, remover)
+
+    results = await asyncio.gather(*(run(d, n) for d, n in groups.items()))
+
+    deleted = 0
+    failures: List[Tuple[str, Exception]] = []
+    for count, errors in results:
+        deleted += count
+        failures.extend(errors)
+    return deleted, failures
+
 
 @dataclass
 class CleanupResult:
@@ -205,27 +283,22 @@ class CleanupManager:
         if dry_run:
             return result
         
-        deleted = 0
-        
         # Remove broken symlinks
-        for link_path in result.broken_symlinks:
-            try:
-                os.unlink(link_path)
-                deleted += 1
-                logger.info(f"Removed broken symlink: {link_path}")
-            except Exception as e:
-                result.errors.append(f"Failed to remove {link_path}: {e}")
-                logger.error(f"Failed to remove broken symlink {link_path}: {e}")
-        
-        # Remove empty directories (bottom-up order already from scan)
-        for dir_path in result.empty_dirs:
-            try:
-                os.rmdir(dir_path)
-                deleted += 1
-                logger.info(f"Removed empty directory: {dir_path}")
-            except Exception as e:
-                result.errors.append(f"Failed to remove {dir_path}: {e}")
-                logger.warning(f"Failed to remove empty dir {dir_path}: {e}")
+        removed_links, failures = await remove_paths(result.broken_symlinks, os.unlink)
+        for link_path, e in failures:
+            result.errors.append(f"Failed to remove {link_path}: {e}")
+            logger.error(f"Failed to remove broken symlink {link_path}: {e}")
+        logger.info(f"Removed {removed_links} broken symlinks")
+        
+        # Remove empty directories (scan only reports dirs that were empty,
+        # so removal order between them does not matter)
+        removed_dirs, failures = await remove_paths(result.empty_dirs, os.rmdir)
+        for dir_path, e in failures:
+            result.errors.append(f"Failed to remove {dir_path}: {e}")
+            logger.warning(f"Failed to remove empty dir {dir_path}: {e}")
+        logger.info(f"Removed {removed_dirs} empty directories")
+        
+        deleted = removed_links + removed_dirs
         
         # Note: Invalid folders and orphaned STRM require manual review
         # We don't auto-delete them as they may need investigation
@@ -3,14 +3,26 @@
 import os
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import FrozenSet, Optional, Tuple
 from urllib.parse import quote
 
-from app.config import get_config
+from app.config import get_config, get_config_version
 
 logger = logging.getLogger(__name__)
 
 
+def _build_mapping_index(mapping: dict) -> Tuple[Tuple[str, str], ...]:
+    """
+    Order path mapping entries longest prefix first, so the first prefix that
+    matches is the longest one. The stable sort keeps mapping order among
+    equal-length prefixes; an empty prefix never counts as a match.
+    """
+    return tuple(sorted(
+        ((prefix, url) for prefix, url in mapping.items() if prefix),
+        key=lambda item: -len(item[0]),
+    ))
+
+
 class StrmGenerator:
     """
     STRM file generator.
@@ -44,6 +56,15 @@ class StrmGenerator:
         self._output_path_override = output_path
         self._path_mapping_override = path_mapping
         self._extensions_override = extensions
+        # Extension sets are built once: the override here, the config one per config version
+        self._extensions_override_set: Optional[FrozenSet[str]] = (
+            frozenset(ext.lower() if ext.startswith(".") else f".{ext.lower()}" for ext in extensions)
+            if extensions else None
+        )
+        self._extensions_cache: Optional[Tuple[int, FrozenSet[str]]] = None
+        # Same for the path mapping index
+        self._mapping_override_index = _build_mapping_index(path_mapping) if path_mapping else None
+        self._mapping_cache: Optional[Tuple[int, Tuple[Tuple[str, str], ...]]] = None
         self._url_encode_override = url_encode
         self._keep_structure_override = keep_structure
         
@@ -62,6 +83,16 @@ class StrmGenerator:
     def path_mapping(self) -> dict:
         return self._path_mapping_override or get_config().path_mapping
 
+    def _mapping_index(self) -> Tuple[Tuple[str, str], ...]:
+        """Path mapping as (prefix, url) pairs, longest prefix first"""
+        if self._mapping_override_index is not None:
+            return self._mapping_override_index
+        version = get_config_version()
+        cached = self._mapping_cache
+        if cached is None or cached[0] != version:
+            cached = self._mapping_cache = (version, _build_mapping_index(get_config().path_mapping))
+        return cached[1]
+
     @property
     def url_encode(self) -> bool:
         if self._url_encode_override is not None:
@@ -75,10 +106,15 @@ class StrmGenerator:
         return get_config().strm.keep_structure
 
     @property
-    def extensions(self) -> set:
-        if self._extensions_override:
-            return set(ext.lower() if ext.startswith(".") else f".{ext.lower()}" for ext in self._extensions_override)
-        return set(ext.lower() for ext in get_config().strm.extensions)
+    def extensions(self) -> FrozenSet[str]:
+        if self._extensions_override_set is not None:
+            return self._extensions_override_set
+        version = get_config_version()
+        cached = self._extensions_cache
+        if cached is None or cached[0] != version:
+            exts = frozenset(ext.lower() for ext in get_config().strm.extensions)
+            cached = self._extensions_cache = (version, exts)
+        return cached[1]
 
     
     def is_video_file(self, filename: str) -> bool:
@@ -91,7 +127,7 @@ class StrmGenerator:
         Returns:
             True if it's a video file
         """
-        ext = Path(filename).suffix.lower()
+        ext = os.path.splitext(filename)[1].lower()
         return ext in self.extensions
 
     def is_subtitle_file(self, filename: str) -> bool:
@@ -135,15 +171,15 @@ class StrmGenerator:
         Returns:
             URL string for the media file
         """
-        # Find matching path mapping
+        # Find the longest matching path mapping
         url_prefix = None
         matched_prefix = ""
         
-        for path_prefix, url in self.path_mapping.items():
+        for path_prefix, url in self._mapping_index():
             if source_path.startswith(path_prefix):
-                if len(path_prefix) > len(matched_prefix):
-                    matched_prefix = path_prefix
-                    url_prefix = url
+                matched_prefix = path_prefix
+                url_prefix = url
+                break
         
         if url_prefix:
             # Replace the path prefix with URL prefix
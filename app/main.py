@@ -19,6 +19,8 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_config
 from app.api import api_router
+from app.api.auth import AuthMiddleware
+from app.api.settings import close_tg_client
 from app.scheduler import get_scheduler_manager
 from app.telegram import start_telegram_bot, stop_telegram_bot
 from app.core.cache import get_cache_manager, close_cache_manager
@@ -105,6 +107,7 @@ async def lifespan(app: FastAPI):
     await stop_telegram_bot()
     await close_openlist_client()
     await close_emby_client()
+    await close_tg_client()
     await close_cache_manager()
     
     logger.info("Goodbye!")
@@ -121,6 +124,10 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Auth middleware (added before CORS so CORS stays outermost and
+# answers preflight requests without credentials)
+app.add_middleware(AuthMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
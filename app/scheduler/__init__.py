@@ -1,5 +1,5 @@
 """Scheduler module for periodic tasks"""
 
-from .jobs import SchedulerManager, get_scheduler_manager
+from .jobs import SchedulerManager, TaskNotFoundError, compile_cron, get_scheduler_manager
 
-__all__ = ["SchedulerManager", "get_scheduler_manager"]
+__all__ = ["SchedulerManager", "TaskNotFoundError", "compile_cron", "get_scheduler_manager"]
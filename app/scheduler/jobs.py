@@ -2,10 +2,10 @@
 
 import asyncio
 import logging
-import uuid
 import json
 from datetime import datetime
-from typing import Callable, Dict, List, Optional
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
@@ -18,6 +18,37 @@ from app.config import get_config, TaskConfig
 logger = logging.getLogger(__name__)
 
 
+class TaskNotFoundError(Exception):
+    """Raised when a task ID is not registered with the scheduler"""
+    def __init__(self, task_id: str):
+        self.task_id = task_id
+        super().__init__(f"Task not found: {task_id}")
+
+
+@lru_cache(maxsize=512)
+def compile_cron(cron_expr: str) -> CronTrigger:
+    """
+    Parse and validate a cron expression into a (shared, stateless) CronTrigger.
+    
+    Supports 5-field format: minute hour day month day_of_week,
+    or 6 fields with a leading seconds field.
+    
+    Raises:
+        ValueError: If the expression is malformed
+    """
+    parts = cron_expr.strip().split()
+    
+    if len(parts) == 5:
+        fields = dict(zip(("minute", "hour", "day", "month", "day_of_week"), parts))
+    elif len(parts) == 6:
+        # With seconds
+        fields = dict(zip(("second", "minute", "hour", "day", "month", "day_of_week"), parts))
+    else:
+        raise ValueError(f"Invalid cron expression: {cron_expr}")
+    
+    return CronTrigger(**fields)
+
+
 class SchedulerManager:
     """
     Manages scheduled scanning jobs using APScheduler.
@@ -37,37 +68,16 @@ class SchedulerManager:
         self._scheduler: Optional[AsyncIOScheduler] = None
         self._running = False
         self._tasks: Dict[str, TaskConfig] = {}
+        # Immutable view of _tasks for readers; replaced on add/remove only
+        self._tasks_snapshot: Tuple[TaskConfig, ...] = ()
+        self._version = 0
         self._on_scan_complete: Optional[Callable] = None
         self._on_scan_error: Optional[Callable] = None
     
-    def _parse_cron(self, cron_expr: str) -> dict:
-        """
-        Parse cron expression to APScheduler format.
-        
-        Supports 5-field format: minute hour day month day_of_week
-        """
-        parts = cron_expr.strip().split()
-        
-        if len(parts) == 5:
-            return {
-                "minute": parts[0],
-                "hour": parts[1],
-                "day": parts[2],
-                "month": parts[3],
-                "day_of_week": parts[4],
-            }
-        elif len(parts) == 6:
-            # With seconds
-            return {
-                "second": parts[0],
-                "minute": parts[1],
-                "hour": parts[2],
-                "day": parts[3],
-                "month": parts[4],
-                "day_of_week": parts[5],
-            }
-        else:
-            raise ValueError(f"Invalid cron expression: {cron_expr}")
+    def _publish_tasks(self) -> None:
+        """Rebuild the read-only task snapshot after _tasks gains or loses entries"""
+        self._tasks_snapshot = tuple(self._tasks.values())
+        self._version += 1
     
     def _get_job_id(self, task_id: str) -> str:
         """Get APScheduler job ID from task ID"""
@@ -212,13 +222,11 @@ class SchedulerManager:
                 
             else:
                 # Default to Cron
-                cron_params = self._parse_cron(sval or task.cron)
-                return CronTrigger(**cron_params)
+                return compile_cron(sval or task.cron)
         except Exception as e:
             logger.error(f"Failed to create trigger for task {task.id} (type={stype}, val={sval}): {e}")
             # Fallback to a safe default (e.g. Cron from task.cron)
-            cron_params = self._parse_cron(task.cron)
-            return CronTrigger(**cron_params)
+            return compile_cron(task.cron)
 
     async def _add_job(self, task: TaskConfig) -> bool:
         """Add a job to the scheduler"""
@@ -292,9 +300,12 @@ class SchedulerManager:
             self._tasks["default"] = default_task
             await self._add_job(default_task)
         
+        self._publish_tasks()
+        
         # Start scheduler
         self._scheduler.start()
         self._running = True
+        self._version += 1
 
         # Weekly sync job (Monday 03:30)
         self._scheduler.add_job(
@@ -321,6 +332,7 @@ class SchedulerManager:
             self._scheduler.shutdown(wait=False)
             self._scheduler = None
         self._running = False
+        self._version += 1
         logger.info("Scheduler stopped")
     
     # ============ Task Management API ============
@@ -338,8 +350,8 @@ class SchedulerManager:
         """
         Create and schedule a new task.
         """
+        # TaskConfig generates the task_<hex> ID itself
         task = TaskConfig(
-            id=f"task_{uuid.uuid4().hex[:8]}",
             name=name,
             folder=folder,
             schedule_type=schedule_type,
@@ -350,6 +362,7 @@ class SchedulerManager:
         )
         
         self._tasks[task.id] = task
+        self._publish_tasks()
         
         if enabled and self._scheduler:
             await self._add_job(task)
@@ -372,6 +385,7 @@ class SchedulerManager:
         
         await self._remove_job(task_id)
         del self._tasks[task_id]
+        self._publish_tasks()
         
         logger.info(f"Deleted task: {task_id}")
         return True
@@ -426,6 +440,9 @@ class SchedulerManager:
         if not task:
             return False
         
+        if task.enabled:
+            return True  # Already in the target state
+        
         task.enabled = True
         if not task.paused:
             await self._add_job(task)
@@ -439,6 +456,9 @@ class SchedulerManager:
         if not task:
             return False
         
+        if not task.enabled:
+            return True  # Already in the target state
+        
         task.enabled = False
         await self._remove_job(task_id)
         
@@ -451,6 +471,9 @@ class SchedulerManager:
         if not task:
             return False
         
+        if task.paused:
+            return True  # Already in the target state
+        
         task.paused = True
         await self._remove_job(task_id)
         
@@ -463,6 +486,9 @@ class SchedulerManager:
         if not task:
             return False
         
+        if not task.paused:
+            return True  # Already in the target state
+        
         task.paused = False
         if task.enabled:
             await self._add_job(task)
@@ -470,25 +496,67 @@ class SchedulerManager:
         logger.info(f"Resumed task: {task.name}")
         return True
     
-    async def run_task_now(self, task_id: str) -> dict:
+    async def pause_all(
+        self,
+        predicate: Callable[[TaskConfig], bool] = lambda t: t.enabled and not t.paused,
+    ) -> List[str]:
+        """
+        Pause every task matching predicate in a single pass.
+        
+        Job removals run back-to-back on the loop without yielding, so a
+        bulk pause is one call instead of one request per task.
+        
+        Returns:
+            IDs of the paused tasks
+        """
+        paused = []
+        for task in self._tasks.values():
+            if not predicate(task):
+                continue
+            task.paused = True
+            await self._remove_job(task.id)
+            paused.append(task.id)
+        
+        logger.info(f"Paused {len(paused)} tasks")
+        return paused
+    
+    async def resume_all(
+        self,
+        predicate: Callable[[TaskConfig], bool] = lambda t: t.paused,
+    ) -> List[str]:
+        """
+        Resume every task matching predicate in a single pass.
+        
+        Returns:
+            IDs of the resumed tasks
+        """
+        resumed = []
+        for task in self._tasks.values():
+            if not predicate(task):
+                continue
+            task.paused = False
+            if task.enabled:
+                await self._add_job(task)
+            resumed.append(task.id)
+        
+        logger.info(f"Resumed {len(resumed)} tasks")
+        return resumed
+    
+    async def run_task_now(self, task_id: str) -> None:
         """
         Trigger immediate execution of a task.
         
         Args:
             task_id: Task ID to run
             
-        Returns:
-            Execution result
+        Raises:
+            TaskNotFoundError: If the task does not exist
+            Exception: Whatever the scan itself raised
         """
-        task = self._tasks.get(task_id)
-        if not task:
-            return {"success": False, "error": "Task not found"}
+        if task_id not in self._tasks:
+            raise TaskNotFoundError(task_id)
         
-        try:
-            await self._execute_task(task_id)
-            return {"success": True, "task_id": task_id}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        await self._execute_task(task_id)
     
     def get_task(self, task_id: str) -> Optional[TaskConfig]:
         """Get a task by ID"""
@@ -496,10 +564,7 @@ class SchedulerManager:
     
     def get_all_tasks(self) -> List[dict]:
         """Get all tasks with their current status"""
-        tasks = []
-        for task in self._tasks.values():
-            tasks.append(task.to_dict())
-        return tasks
+        return [task.to_dict() for task in self._tasks_snapshot]
     
     def set_on_complete(self, callback: Callable) -> None:
         """Set callback for scan completion"""
@@ -509,14 +574,19 @@ class SchedulerManager:
         """Set callback for scan error"""
         self._on_scan_error = callback
     
+    @property
+    def version(self) -> str:
+        """Changes whenever status may differ: task set, any task field or running flag"""
+        return f"{self._version}.{TaskConfig.revision}"
+    
     @property
     def status(self) -> dict:
         """Get scheduler status"""
-        active_tasks = [t for t in self._tasks.values() if t.enabled and not t.paused]
+        tasks = self._tasks_snapshot
         return {
             "running": self._running,
-            "total_tasks": len(self._tasks),
-            "active_tasks": len(active_tasks),
+            "total_tasks": len(tasks),
+            "active_tasks": sum(1 for t in tasks if t.enabled and not t.paused),
             "tasks": self.get_all_tasks(),
         }
 
@@ -19,6 +19,20 @@ const state = {
 
 // ==================== Utility Functions ====================
 
+// FastAPI returns a string detail for HTTPException, but a list of
+// {loc, msg} objects for request validation errors (422)
+function formatErrorDetail(detail, fallback) {
+    if (Array.isArray(detail)) {
+        return detail
+            .map(err => {
+                const field = (err.loc || []).filter(part => part !== 'body').join('.');
+                return field ? `${field}: ${err.msg}` : err.msg;
+            })
+            .join('; ') || fallback;
+    }
+    return detail || fallback;
+}
+
 async function apiRequest(endpoint, method = 'GET', data = null) {
     const options = {
         method,
@@ -43,7 +57,7 @@ async function apiRequest(endpoint, method = 'GET', data = null) {
         const result = await response.json();
 
         if (!response.ok) {
-            throw new Error(result.detail || 'Request failed');
+            throw new Error(formatErrorDetail(result.detail, 'Request failed'));
         }
 
         return result;
@@ -1422,7 +1436,7 @@ async function importConfig(input) {
         const result = await response.json();
 
         if (!response.ok) {
-            throw new Error(result.detail || 'Import failed');
+            throw new Error(formatErrorDetail(result.detail, 'Import failed'));
         }
 
         showToast('成功', '配置已导入', 'success');
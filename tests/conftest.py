@@ -0,0 +1,27 @@
+"""Shared fixtures: every test runs against its own config file"""
+
+import pytest
+
+import app.config as config_module
+from app.config import SECRET_ENV_BINDINGS, Config, reload_config
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    """Point CONFIG_PATH at a fresh default config and make it the live config"""
+    path = tmp_path / "config.yml"
+    monkeypatch.setenv("CONFIG_PATH", str(path))
+    for env_var, _ in SECRET_ENV_BINDINGS.values():
+        monkeypatch.delenv(env_var, raising=False)
+
+    # Restore the module globals afterwards so tests don't leak config
+    monkeypatch.setattr(config_module, "_config", None)
+    config_module._LOAD_CACHE.clear()
+    config_module._RESOLVED_PATHS.clear()
+
+    assert Config().save(str(path))
+    reload_config()
+    yield path
+
+    config_module._LOAD_CACHE.clear()
+    config_module._RESOLVED_PATHS.clear()
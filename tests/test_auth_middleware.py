@@ -0,0 +1,94 @@
+"""AuthMiddleware and exempt-path matching"""
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.api.auth import AuthMiddleware, is_exempt_path
+from app.config import get_config
+
+API_TOKEN = "placeholder-api-token"
+
+
+@pytest.mark.parametrize("path", [
+    "/api/health",
+    "/api/health/",
+    "/api/health/deep",
+    "/api/auth/login",
+    "/static",
+    "/static/js/app.js",
+    "/favicon.ico",
+])
+def test_exempt_paths(path):
+    assert is_exempt_path(path)
+
+
+@pytest.mark.parametrize("path", [
+    "/api/healthz",
+    "/api/health-check",
+    "/api/auth",
+    "/api/auth/password",
+    "/staticfiles",
+    "/api/static",
+    "/",
+])
+def test_non_exempt_paths(path):
+    # An exempt entry only matches whole path segments, never a prefix of one
+    assert not is_exempt_path(path)
+
+
+@pytest.fixture
+def client(config_path):
+    auth = get_config().web.auth
+    auth.enabled = True
+    auth.api_token = API_TOKEN
+    assert get_config().save()
+
+    app = FastAPI()
+    app.add_middleware(AuthMiddleware)
+
+    @app.get("/{path:path}")
+    async def echo(path: str, request: Request):
+        return {"user": getattr(request.state, "user", None)}
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/api/health", "/api/health/deep", "/", "/login"])
+def test_exempt_and_non_api_paths_pass_without_credentials(client, path):
+    resp = client.get(path)
+
+    assert resp.status_code == 200
+    assert resp.json() == {"user": None}
+
+
+@pytest.mark.parametrize("path", ["/api/healthz", "/api/settings", "/api/auth/password"])
+def test_protected_paths_require_credentials(client, path):
+    resp = client.get(path)
+
+    assert resp.status_code == 401
+    assert resp.headers["www-authenticate"] == "Bearer"
+
+
+def test_bearer_token_sets_request_user(client):
+    resp = client.get("/api/settings", headers={"Authorization": f"Bearer {API_TOKEN}"})
+
+    assert resp.status_code == 200
+    assert resp.json() == {"user": "api_user"}
+
+
+def test_wrong_bearer_token_is_rejected(client):
+    resp = client.get("/api/settings", headers={"Authorization": "Bearer placeholder-wrong"})
+
+    assert resp.status_code == 401
+
+
+def test_disabled_auth_lets_everything_through(client):
+    config = get_config()
+    config.web.auth.enabled = False
+    assert config.save()
+
+    resp = client.get("/api/settings")
+
+    assert resp.status_code == 200
+    assert resp.json() == {"user": "admin"}
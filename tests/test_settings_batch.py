@@ -0,0 +1,93 @@
+"""PUT /settings/batch: one write for many sections, nothing applied on rejection"""
+
+import pytest
+import yaml
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.settings import router
+from app.config import Config, get_config
+
+
+@pytest.fixture
+def client(config_path):
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def save_calls(monkeypatch):
+    """Count Config.save calls while still writing the file"""
+    calls = []
+    original = Config.save
+
+    def counting_save(self, *args, **kwargs):
+        calls.append(self)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(Config, "save", counting_save)
+    return calls
+
+
+def test_batch_applies_sections_with_one_save(client, config_path, save_calls):
+    resp = client.put("/settings/batch", json={
+        "strm": {"mode": "direct_link", "url_encode": False},
+        "scan": {"mode": "full"},
+        "qos": {"qps": 2.5},
+    })
+
+    assert resp.status_code == 200
+    assert resp.json()["updated"] == ["strm", "scan", "qos"]
+    assert len(save_calls) == 1
+
+    on_disk = yaml.safe_load(config_path.read_text(encoding="utf-8"))
+    assert on_disk["strm"]["mode"] == "direct_link"
+    assert on_disk["strm"]["url_encode"] is False
+    assert on_disk["scan"]["mode"] == "full"
+    assert on_disk["qos"]["qps"] == 2.5
+
+
+def test_batch_without_changes_does_not_save(client, save_calls):
+    current = get_config().strm.mode
+
+    resp = client.put("/settings/batch", json={"strm": {"mode": current}})
+
+    assert resp.status_code == 200
+    assert resp.json() == {"message": "No changes", "updated": [], "success": True}
+    assert save_calls == []
+
+
+def test_batch_rejects_env_managed_secret_before_applying_anything(client, monkeypatch, save_calls):
+    monkeypatch.setenv("TELEGRAM_TOKEN", "placeholder-env-token")
+    config = get_config()
+    old_token = config.openlist.token
+    old_mode = config.strm.mode
+
+    resp = client.put("/settings/batch", json={
+        "openlist": {"token": "placeholder-new-token"},
+        "strm": {"mode": "direct_link" if old_mode == "path" else "path"},
+        "telegram": {"token": "placeholder-other-token"},
+    })
+
+    assert resp.status_code == 409
+    assert config.openlist.token == old_token
+    assert config.strm.mode == old_mode
+    assert save_calls == []
+
+
+def test_batch_masked_secret_is_not_treated_as_a_change(client, monkeypatch):
+    # The UI echoes "***" for configured secrets; that must not trip the env check
+    monkeypatch.setenv("TELEGRAM_TOKEN", "placeholder-env-token")
+
+    resp = client.put("/settings/batch", json={"telegram": {"token": "***", "enabled": True}})
+
+    assert resp.status_code == 200
+
+
+def test_batch_rejects_unknown_mode_with_validation_error(client, save_calls):
+    resp = client.put("/settings/batch", json={"strm": {"mode": "bogus"}})
+
+    assert resp.status_code == 422
+    assert resp.json()["detail"][0]["loc"] == ["body", "strm", "mode"]
+    assert save_calls == []
@@ -0,0 +1,54 @@
+"""GET /tasks: weak ETag revalidation"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.tasks import router
+from app.config import TaskConfig
+
+
+@pytest.fixture
+def client(config_path):
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_list_tasks_sends_weak_etag(client):
+    resp = client.get("/tasks")
+
+    assert resp.status_code == 200
+    assert resp.headers["etag"].startswith('W/"')
+    assert resp.headers["cache-control"] == "no-cache"
+    assert set(resp.json()) == {"tasks", "status"}
+
+
+def test_matching_etag_returns_304_without_body(client):
+    etag = client.get("/tasks").headers["etag"]
+
+    resp = client.get("/tasks", headers={"If-None-Match": etag})
+
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+
+
+def test_task_field_change_invalidates_etag(client):
+    etag = client.get("/tasks").headers["etag"]
+
+    # Any task field change bumps TaskConfig.revision, part of the ETag
+    task = TaskConfig(id="task_test")
+    task.paused = True
+
+    resp = client.get("/tasks", headers={"If-None-Match": etag})
+
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+
+
+def test_stale_etag_gets_full_response(client):
+    resp = client.get("/tasks", headers={"If-None-Match": 'W/"0.0.0"'})
+
+    assert resp.status_code == 200
+    assert "tasks" in resp.json()